@@ -27,7 +27,18 @@ def post_with_group(user, group):
 
 
 @pytest.fixture
-def few_posts_with_group(mixer, user, group):
+def post_factory():
+    """Create posts in one INSERT instead of a query per row."""
+    def create(count, **fields):
+        return Post.objects.bulk_create(
+            Post(text=f'Тестовый пост {index}', **fields)
+            for index in range(count)
+        )
+    return create
+
+
+@pytest.fixture
+def few_posts_with_group(post_factory, user, group):
     """Return one record with the same author and group."""
-    posts = mixer.cycle(20).blend(Post, author=user, group=group)
+    posts = post_factory(20, author=user, group=group)
     return posts[0]
@@ -1,9 +1,13 @@
 from django.views.generic.base import TemplateView
 
+from core.prerender import PrerenderedMixin
 
-class AboutAuthorView(TemplateView):
+
+class AboutAuthorView(PrerenderedMixin, TemplateView):
     template_name = 'about/author.html'
+    prerendered_name = 'about_author'
 
 
-class AboutTechView(TemplateView):
+class AboutTechView(PrerenderedMixin, TemplateView):
     template_name = 'about/tech.html'
+    prerendered_name = 'about_tech'
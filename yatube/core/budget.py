@@ -0,0 +1,163 @@
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from functools import wraps
+
+import django
+from django.conf import settings
+from django.db import connection
+from django.template.base import Node
+
+logger = logging.getLogger(__name__)
+
+# сколько раз каждый view вышел за бюджет с запуска процесса
+overruns = Counter()
+
+RENDER_CODE = Node.render_annotated.__code__
+DJANGO_DIR = os.path.dirname(os.path.dirname(django.__file__))
+ORM_DIR = os.path.join('django', 'db', '')
+# сколько самых частых источников запросов показать в отчёте
+REPORT_ORIGINS: int = 5
+
+
+class BudgetExceeded(AssertionError):
+    """View сделал больше запросов или работал дольше, чем заявлено."""
+
+
+def is_project_file(filename):
+    return (
+        filename.startswith(settings.BASE_DIR)
+        and 'site-packages' not in filename
+    )
+
+
+def frame_location(frame, base_dir):
+    filename = os.path.relpath(frame.f_code.co_filename, base_dir)
+    return f'{filename}:{frame.f_lineno}'
+
+
+def query_origin(frame):
+    """Ближайшая к запросу строка шаблона или кода проекта.
+
+    Если до самого view не нашлось ни того ни другого (сессия,
+    middleware), называется первый кадр за пределами ORM.
+    """
+    fallback = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if frame.f_code is RENDER_CODE:
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            token = getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                name = origin.template_name or origin.name
+                return f'{name}:{token.lineno}'
+        elif frame.f_globals.get('__name__') == __name__:
+            # дальше — код, вызвавший view
+            break
+        elif is_project_file(filename):
+            return frame_location(frame, settings.BASE_DIR)
+        elif fallback is None and ORM_DIR not in filename:
+            fallback = frame_location(frame, DJANGO_DIR)
+        frame = frame.f_back
+    return fallback or '?'
+
+
+class Recorder:
+    """execute_wrapper, который считает запросы к БД.
+
+    Обход стека ради источника запроса дорог, поэтому источники
+    запоминаются только для запросов сверх бюджета, а при trace
+    (BUDGET_STRICT в тестах) — для всех: отчёт о провале теста полный.
+    """
+
+    def __init__(self, budget=None, trace=False):
+        self.budget = budget
+        self.trace = trace
+        self.count = 0
+        self.origins = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        if self.trace or (
+            self.budget is not None and self.count > self.budget
+        ):
+            self.origins[query_origin(sys._getframe(1))] += 1
+        return execute(sql, params, many, context)
+
+
+def check_budget(name, recorder, elapsed, queries, ms):
+    """Сверяет view с бюджетом.
+
+    Ошибкой в тестах (BUDGET_STRICT) бывает только лишний запрос: время
+    на общем CI шумит, поэтому превышение по времени всегда уходит в лог.
+    """
+    too_many = queries is not None and recorder.count > queries
+    too_slow = ms is not None and elapsed * 1000 > ms
+    if not too_many and not too_slow:
+        return
+    problems = []
+    if too_many:
+        problems.append(f'{recorder.count} запросов при бюджете {queries}')
+    if too_slow:
+        problems.append(f'{elapsed * 1000:.0f} мс при бюджете {ms} мс')
+    message = f'{name}: {"; ".join(problems)}'
+    if recorder.origins:
+        origins = ', '.join(
+            f'{origin} ×{count}'
+            for origin, count in recorder.origins.most_common(REPORT_ORIGINS)
+        )
+        label = 'Запросы' if recorder.trace else 'Запросы сверх бюджета'
+        message = f'{message}. {label}: {origins}'
+    overruns[name] += 1
+    if too_many and settings.BUDGET_STRICT:
+        raise BudgetExceeded(message)
+    logger.warning(message)
+
+
+def query_budget(queries=None, ms=None, name=None):
+    """Бюджет view: не больше queries запросов к БД и ms миллисекунд.
+
+    Потоковый ответ учитывается целиком, вместе с частями, которые
+    рисуются при отправке. В тестах (BUDGET_STRICT) лишние запросы —
+    ошибка, в остальном превышение — предупреждение в лог и счётчик
+    overruns. Отчёт называет строки шаблонов и кода, откуда пришли
+    запросы. name нужен для method_decorator: у dispatch нет своего
+    имени.
+    """
+    def decorator(view_func):
+        view_name = name or (
+            f'{view_func.__module__}.{view_func.__qualname__}'
+        )
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not settings.BUDGET_ENABLED:
+                return view_func(request, *args, **kwargs)
+            recorder = Recorder(queries, trace=settings.BUDGET_STRICT)
+            started = time.perf_counter()
+            with connection.execute_wrapper(recorder):
+                response = view_func(request, *args, **kwargs)
+            if not getattr(response, 'streaming', False):
+                check_budget(
+                    view_name, recorder, time.perf_counter() - started,
+                    queries, ms,
+                )
+                return response
+
+            def streaming_content(content):
+                with connection.execute_wrapper(recorder):
+                    yield from content
+                check_budget(
+                    view_name, recorder, time.perf_counter() - started,
+                    queries, ms,
+                )
+
+            response.streaming_content = streaming_content(
+                response.streaming_content
+            )
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,10 @@
+from django.db.models import Case, Value, When
+
+
+def case_by_pk(values, output_field, default=0):
+    """CASE pk WHEN ... THEN ... END для массового UPDATE одним запросом."""
+    return Case(
+        *[When(pk=pk, then=Value(value)) for pk, value in values.items()],
+        default=Value(default),
+        output_field=output_field,
+    )
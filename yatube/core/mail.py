@@ -0,0 +1,171 @@
+import atexit
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+logger = logging.getLogger(__name__)
+
+EMAIL_BATCH_SIZE: int = 50
+# Сколько ждать, пока соберётся пачка писем
+EMAIL_BATCH_WAIT: float = 0.5
+EMAIL_RETRIES: int = 4
+EMAIL_BACKOFF: float = 1.0
+# Сколько при остановке процесса ждать доставки оставшихся писем
+EMAIL_DRAIN_TIMEOUT: float = 10.0
+
+
+class MailQueue:
+    """Очередь писем с фоновым воркером, отправляющим их пачками.
+
+    Неотправленные письма не держат воркер: они ждут повтора в
+    отдельном списке, а воркер тем временем отправляет остальную почту.
+    """
+
+    def __init__(self, batch_size=EMAIL_BATCH_SIZE,
+                 batch_wait=EMAIL_BATCH_WAIT, retries=EMAIL_RETRIES,
+                 backoff=EMAIL_BACKOFF):
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.retries = retries
+        self.backoff = backoff
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        # куча (когда повторить, номер, попытка, письма)
+        self._delayed = []
+        self._counter = itertools.count()
+        self._draining = False
+
+    def put(self, messages):
+        for message in messages:
+            self._queue.put(message)
+        self._ensure_worker()
+
+    def join(self):
+        """Дождаться доставки всего, что уже стоит в очереди."""
+        self._queue.join()
+
+    def drain(self, timeout=EMAIL_DRAIN_TIMEOUT):
+        """Доставить очередь при остановке процесса, не дольше timeout.
+
+        Повторы перестают ждать паузы. Возвращает False, если письма
+        остались неотправленными.
+        """
+        self._draining = True
+        deadline = time.monotonic() + timeout
+        done = self._queue.all_tasks_done
+        with done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.error(
+                        'При остановке не отправлено %s писем',
+                        self._queue.unfinished_tasks,
+                    )
+                    return False
+                done.wait(remaining)
+        return True
+
+    def retry_delay(self, attempt):
+        return self.backoff * 2 ** attempt
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name='mail-queue', daemon=True
+                )
+                self._worker.start()
+
+    def _due_retry(self):
+        """Пачка, чей повтор уже пора отправить, и пауза до следующей."""
+        if not self._delayed:
+            return None, None
+        now = time.monotonic()
+        if self._draining or self._delayed[0][0] <= now:
+            _, _, attempt, batch = heapq.heappop(self._delayed)
+            return (attempt, batch), None
+        return None, self._delayed[0][0] - now
+
+    def _next_batch(self):
+        while True:
+            retry, wait = self._due_retry()
+            if retry is not None:
+                return retry
+            if wait is not None:
+                # пока повтор ждёт, проверяем и отложенные, и новые письма
+                wait = min(wait, self.batch_wait)
+            try:
+                batch = [self._queue.get(timeout=wait)]
+            except queue.Empty:
+                continue
+            break
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return 0, batch
+
+    def _run(self):
+        while True:
+            attempt, batch = self._next_batch()
+            rest = self.deliver(batch)
+            if rest and attempt < self.retries:
+                heapq.heappush(self._delayed, (
+                    time.monotonic() + self.retry_delay(attempt),
+                    next(self._counter), attempt + 1, rest,
+                ))
+                finished = len(batch) - len(rest)
+            else:
+                if rest:
+                    logger.error('Не удалось отправить %s писем', len(rest))
+                finished = len(batch)
+            for _ in range(finished):
+                self._queue.task_done()
+
+    def deliver(self, batch):
+        """Одно соединение на пачку; возвращает неотправленные письма.
+
+        Письма передаются движку по одному: при обрыве посреди пачки
+        повторяются только те, что не ушли.
+        """
+        sent = 0
+        try:
+            connection = get_connection(
+                settings.EMAIL_QUEUE_BACKEND, fail_silently=False
+            )
+            with connection:
+                for message in batch:
+                    connection.send_messages([message])
+                    sent += 1
+        except Exception:
+            logger.warning(
+                'Сбой отправки, отложено %s писем', len(batch) - sent,
+                exc_info=True,
+            )
+        return batch[sent:]
+
+
+mail_queue = MailQueue()
+atexit.register(mail_queue.drain)
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Ставит письма в очередь и сразу возвращает управление view."""
+
+    def send_messages(self, email_messages):
+        messages = list(email_messages)
+        mail_queue.put(messages)
+        return len(messages)
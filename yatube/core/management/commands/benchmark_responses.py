@@ -0,0 +1,89 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+ENCODINGS = ('identity', 'gzip', 'br')
+# первая часть gzip-потока — только 10-байтовый заголовок без данных
+GZIP_HEADER_LENGTH: int = 10
+
+
+def measure(url, host, encoding):
+    """(до первого байта страницы, до последнего, байт передано)."""
+    client = Client(SERVER_NAME=host, HTTP_ACCEPT_ENCODING=encoding)
+    started = time.perf_counter()
+    response = client.get(url)
+    if not response.streaming:
+        elapsed = time.perf_counter() - started
+        return elapsed, elapsed, len(response.content)
+    first_byte = None
+    size = 0
+    for chunk in response.streaming_content:
+        size += len(chunk)
+        if first_byte is None and size > GZIP_HEADER_LENGTH:
+            first_byte = time.perf_counter() - started
+    return first_byte, time.perf_counter() - started, size
+
+
+def default_urls():
+    urls = [reverse('posts:index')]
+    post = Post.objects.annotate(
+        comments_count=Count('comments')
+    ).order_by('-comments_count').first()
+    if post is not None:
+        urls.append(reverse('posts:post_detail', args=(post.pk,)))
+    return urls
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает обычные и потоковые ответы: время до первого байта, '
+        'полное время и размер передачи без сжатия, с gzip и brotli.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'urls', nargs='*',
+            help='Адреса страниц; по умолчанию главная и пост с самым '
+                 'длинным обсуждением.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Сколько раз открыть каждую страницу; берётся медиана.',
+        )
+        parser.add_argument(
+            '--host', default='localhost',
+            help='Имя хоста в запросах; должно быть в ALLOWED_HOSTS.',
+        )
+
+    def run(self, options):
+        results = []
+        for url in options['urls'] or default_urls():
+            for streaming in (False, True):
+                with override_settings(STREAMING_RESPONSES=streaming):
+                    for encoding in ENCODINGS:
+                        runs = [
+                            measure(url, options['host'], encoding)
+                            for _ in range(options['repeat'])
+                        ]
+                        results.append((
+                            url,
+                            'поток' if streaming else 'буфер',
+                            encoding,
+                            statistics.median(run[0] for run in runs),
+                            statistics.median(run[1] for run in runs),
+                            runs[-1][2],
+                        ))
+        return results
+
+    def handle(self, *args, **options):
+        for url, mode, encoding, first_byte, total, size in self.run(options):
+            self.stdout.write(
+                f'{mode:<6} {encoding:<9} TTFB {first_byte * 1000:7.1f} мс  '
+                f'всего {total * 1000:7.1f} мс  {size:>8} байт  {url}'
+            )
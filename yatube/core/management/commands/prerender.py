@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.prerender import prerender_all
+
+
+class Command(BaseCommand):
+    help = (
+        'Собирает статичные страницы (about, 404) в файлы. '
+        'Запускать при деплое.'
+    )
+
+    def handle(self, *args, **options):
+        for path in prerender_all():
+            self.stdout.write(f'Готово: {path}')
@@ -0,0 +1,101 @@
+import argparse
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# -X importtime не видит модули, загруженные через importlib.import_module
+# (приложения и models.py из INSTALLED_APPS): в отчёт попадают только
+# их собственные импорты
+IMPORTTIME_PREFIX = 'import time:'
+SETUP_CODE = 'import django; django.setup()'
+WSGI_CODE = 'import yatube.wsgi'
+
+
+def parse_importtime(output):
+    """Строки ``-X importtime``: (модуль, своё время, с зависимостями), мкс."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith(IMPORTTIME_PREFIX):
+            continue
+        self_time, cumulative, name = line[len(IMPORTTIME_PREFIX):].split('|')
+        if not self_time.strip().isdigit():
+            # строка заголовка
+            continue
+        modules.append((name.strip(), int(self_time), int(cumulative)))
+    return modules
+
+
+def group_by_package(modules):
+    """Собственное время модулей, сложенное по пакетам верхнего уровня."""
+    packages = defaultdict(int)
+    for name, self_time, _ in modules:
+        packages[name.partition('.')[0]] += self_time
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает, сколько времени уходит на импорт модулей при старте '
+        '(python -X importtime). Без аргументов меряет django.setup(), '
+        'с аргументами — запуск manage.py с ними.'
+    )
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'command', nargs=argparse.REMAINDER,
+            help='Команда manage.py с аргументами.',
+        )
+        parser.add_argument(
+            '--wsgi', action='store_true',
+            help='Мерить импорт yatube.wsgi, как при загрузке воркера.',
+        )
+        parser.add_argument(
+            '--limit', type=int, default=20,
+            help='Сколько строк показать в каждой таблице.',
+        )
+
+    def run(self, options):
+        if options['command']:
+            args = ['manage.py', *options['command']]
+        else:
+            args = ['-c', WSGI_CODE if options['wsgi'] else SETUP_CODE]
+        started = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', *args],
+            cwd=settings.BASE_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        elapsed = time.perf_counter() - started
+        if process.returncode:
+            errors = [
+                line for line in process.stderr.splitlines()
+                if not line.startswith(IMPORTTIME_PREFIX)
+            ]
+            raise CommandError('\n'.join(errors[-20:]))
+        return parse_importtime(process.stderr), elapsed
+
+    def handle(self, *args, **options):
+        modules, elapsed = self.run(options)
+        limit = options['limit']
+        total = sum(self_time for _, self_time, _ in modules)
+        self.stdout.write(
+            f'Запуск: {elapsed * 1000:.0f} мс, импорт {len(modules)} '
+            f'модулей: {total / 1000:.0f} мс'
+        )
+        self.stdout.write('\nПакеты (собственное время модулей):')
+        for package, self_time in group_by_package(modules)[:limit]:
+            self.stdout.write(f'{self_time / 1000:9.1f} мс  {package}')
+        self.stdout.write('\nМодули (вместе с зависимостями):')
+        modules.sort(key=lambda module: module[2], reverse=True)
+        for name, self_time, cumulative in modules[:limit]:
+            self.stdout.write(
+                f'{cumulative / 1000:9.1f} мс  {self_time / 1000:7.1f} мс  '
+                f'{name}'
+            )
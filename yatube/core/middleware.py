@@ -0,0 +1,101 @@
+import re
+from gzip import GzipFile
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import StreamingBuffer, compress_string
+
+try:
+    import brotli
+except ImportError:
+    # brotli — необязательная зависимость: без неё остаётся gzip
+    brotli = None
+
+
+def compress_gzip_sequence(sequence):
+    """Как django.utils.text.compress_sequence, но с flush на каждой части.
+
+    Без flush zlib копит сжатые данные до конца ответа, и поток
+    теряет смысл: первый байт страницы уходит вместе с последним.
+    """
+    buf = StreamingBuffer()
+    with GzipFile(mode='wb', compresslevel=6, fileobj=buf, mtime=0) as zfile:
+        yield buf.read()
+        for item in sequence:
+            zfile.write(item)
+            zfile.flush()
+            yield buf.read()
+    yield buf.read()
+
+
+def compress_brotli(content):
+    return brotli.compress(content, quality=settings.BROTLI_QUALITY)
+
+
+def compress_brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=settings.BROTLI_QUALITY)
+    for item in sequence:
+        yield compressor.process(item) + compressor.flush()
+    yield compressor.finish()
+
+
+# в порядке предпочтения: (кодировка, сжатие строки, сжатие потока)
+ENCODERS = [
+    ('gzip', compress_string, compress_gzip_sequence),
+]
+if brotli is not None:
+    ENCODERS.insert(0, ('br', compress_brotli, compress_brotli_sequence))
+
+
+def accepted_encoder(request):
+    accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    for encoder in ENCODERS:
+        if re.search(r'\b%s\b' % encoder[0], accept_encoding):
+            return encoder
+    return None
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """brotli или gzip для текстовых ответов, в том числе потоковых.
+
+    Замена GZipMiddleware. Ответы короче COMPRESS_MIN_LENGTH не
+    сжимаются: они и так помещаются в один TCP-пакет. Картинки и другие
+    уже сжатые форматы пропускаются.
+    """
+
+    def should_compress(self, response):
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(settings.COMPRESS_CONTENT_TYPES):
+            return False
+        if response.has_header('Content-Encoding'):
+            return False
+        return response.streaming or (
+            len(response.content) >= settings.COMPRESS_MIN_LENGTH
+        )
+
+    def process_response(self, request, response):
+        if not self.should_compress(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoder = accepted_encoder(request)
+        if encoder is None:
+            return response
+        encoding, compress, compress_sequence = encoder
+        if response.streaming:
+            response.streaming_content = compress_sequence(
+                response.streaming_content
+            )
+            del response['Content-Length']
+        else:
+            compressed_content = compress(response.content)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response['Content-Length'] = str(len(response.content))
+        # сильный ETag после сжатия становится слабым (RFC 7232, 2.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,112 @@
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# раз в столько обращений статистика пишется в лог
+STATS_LOG_INTERVAL: int = 1000
+
+
+class ObjectCache:
+    """LRU объектов в памяти процесса с лимитом по байтам и TTL.
+
+    Объекты хранятся в pickle: размер записи известен точно, а каждый
+    запрос получает свою копию и не испортит её для следующих.
+    Теги связывают записи с объектом, чтобы сбросить все его ключи
+    (по pk, по slug) разом.
+    """
+
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # ключ -> (pickle, истекает, теги)
+        self._entries = OrderedDict()
+        self._tags = {}
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            lookups = self.hits + self.misses
+        if lookups % STATS_LOG_INTERVAL == 0:
+            logger.info('Кэш объектов: %s', self.stats())
+        return None if entry is None else pickle.loads(entry[0])
+
+    def set(self, key, obj, tags=(), now=None):
+        now = time.monotonic() if now is None else now
+        data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            while self._entries and self.size + len(data) > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = (data, now + self.ttl, tuple(tags))
+            self.size += len(data)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+    def invalidate(self, *tags):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self.size = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.size,
+        }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= len(entry[0])
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+_cache = None
+
+
+def get_object_cache():
+    global _cache
+    if _cache is None:
+        _cache = ObjectCache(
+            settings.OBJECT_CACHE_MAX_BYTES, settings.OBJECT_CACHE_TTL
+        )
+    return _cache
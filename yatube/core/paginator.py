@@ -0,0 +1,111 @@
+import datetime
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Q, QuerySet
+from django.utils.functional import cached_property
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+# Ниже этого порога честный COUNT(*) дешевле любой оценки
+ESTIMATE_THRESHOLD: int = 10000
+
+
+def estimate_count(model, using='default'):
+    """Приблизительное число строк в таблице модели без COUNT(*)."""
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row else 0
+    # Для целочисленного автоинкремента MAX(pk) берётся из индекса
+    # и даёт оценку сверху, равную числу строк при отсутствии удалений.
+    return model._default_manager.using(using).aggregate(
+        estimate=Max('pk')
+    )['estimate'] or 0
+
+
+def where_sql(queryset):
+    query = queryset.query
+    return query.get_compiler(queryset.db).compile(query.where)
+
+
+def is_filtered(queryset):
+    """Есть ли у выборки условия сверх фильтра менеджера по умолчанию.
+
+    Менеджер может сам скрывать строки (например, удалённые); такая
+    выборка всё равно считается «всей таблицей», и для неё годится
+    оценка.
+    """
+    if not queryset.query.where:
+        return False
+    base = queryset.model._default_manager.using(queryset.db).all()
+    return where_sql(queryset) != where_sql(base)
+
+
+class ElidedPaginator(Paginator):
+    """Paginator с сокращённой навигацией: 1 2 … 7 8 [9] 10 11 … 99 100."""
+
+    ELLIPSIS = '…'
+
+    def get_elided_page_range(self, number=1, on_each_side=2, on_ends=2):
+        number = self.validate_number(number)
+        num_pages = self.num_pages
+        if num_pages <= (on_each_side + on_ends) * 2:
+            return list(self.page_range)
+        pages = []
+        if number > 1 + on_each_side + on_ends + 1:
+            pages.extend(range(1, on_ends + 1))
+            pages.append(self.ELLIPSIS)
+            pages.extend(range(number - on_each_side, number + 1))
+        else:
+            pages.extend(range(1, number + 1))
+        if number < num_pages - on_each_side - on_ends - 1:
+            pages.extend(range(number + 1, number + on_each_side + 1))
+            pages.append(self.ELLIPSIS)
+            pages.extend(range(num_pages - on_ends + 1, num_pages + 1))
+        else:
+            pages.extend(range(number + 1, num_pages + 1))
+        return pages
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator, который не считает всю таблицу без фильтров."""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet) or is_filtered(queryset):
+            return super().count
+        estimate = estimate_count(queryset.model, queryset.db)
+        if estimate < ESTIMATE_THRESHOLD:
+            return super().count
+        return estimate
+
+
+def encode_cursor(obj, field='pub_date'):
+    """Курсор «после этой строки» для ленты, упорядоченной по (-field, -pk).
+
+    Время хранится в целых микросекундах: без потерь точности и без
+    символов, которые пришлось бы экранировать в URL.
+    """
+    return f'{(getattr(obj, field) - EPOCH) // MICROSECOND}_{obj.pk}'
+
+
+def decode_cursor(value):
+    """(время, pk) из курсора; ValueError, если курсор испорчен."""
+    microseconds, pk = value.split('_')
+    return EPOCH + int(microseconds) * MICROSECOND, int(pk)
+
+
+def before_cursor(queryset, cursor, field='pub_date'):
+    """Строки после курсора: страница по индексу без OFFSET."""
+    moment, pk = decode_cursor(cursor)
+    return queryset.filter(
+        Q(**{f'{field}__lt': moment}) | Q(**{field: moment, 'pk__lt': pk})
+    ).order_by(f'-{field}', '-pk')
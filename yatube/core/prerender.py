@@ -0,0 +1,99 @@
+import hashlib
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils.cache import get_conditional_response
+from django.utils.html import escape
+
+# Вместо адреса в 404 подставляется request.path при ответе
+PATH_PLACEHOLDER = '__prerender_path__'
+
+# имя файла: (шаблон, имя URL для подсветки меню, контекст)
+PRERENDERED_PAGES = {
+    'about_author': ('about/author.html', 'about:author', {}),
+    'about_tech': ('about/tech.html', 'about:tech', {}),
+    '404': ('core/404.html', None, {'path': PATH_PLACEHOLDER}),
+}
+
+
+def page_path(name):
+    return os.path.join(settings.PRERENDER_ROOT, f'{name}.html')
+
+
+def render_page(name):
+    """Страница глазами анонимного посетителя, как её отдал бы view."""
+    template, url_name, context = PRERENDERED_PAGES[name]
+    path = reverse(url_name) if url_name else f'/{PATH_PLACEHOLDER}/'
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    request.resolver_match = resolve(path) if url_name else None
+    return render_to_string(template, context, request=request)
+
+
+def prerender_all():
+    os.makedirs(settings.PRERENDER_ROOT, exist_ok=True)
+    written = []
+    for name in PRERENDERED_PAGES:
+        with open(page_path(name), 'w', encoding='utf-8') as file:
+            file.write(render_page(name))
+        written.append(page_path(name))
+    load_page.cache_clear()
+    return written
+
+
+@lru_cache(maxsize=None)
+def load_page(name):
+    """(содержимое, ETag) готовой страницы; читается один раз на процесс."""
+    try:
+        with open(page_path(name), 'rb') as file:
+            content = file.read()
+    except FileNotFoundError:
+        return None
+    return content, '"%s"' % hashlib.sha256(content).hexdigest()
+
+
+def prerendered_response(request, name):
+    """Ответ из готового файла или None, если отдать его нельзя."""
+    if not settings.PRERENDER_ENABLED or request.user.is_authenticated:
+        return None
+    page = load_page(name)
+    if page is None:
+        return None
+    content, etag = page
+    response = HttpResponse(content)
+    response['ETag'] = etag
+    response['Cache-Control'] = f'public, max-age={settings.PRERENDER_MAX_AGE}'
+    # слабое сравнение: после сжатия клиент вернёт W/"..."
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def prerendered_not_found(request):
+    page = (
+        load_page('404')
+        if settings.PRERENDER_ENABLED and not request.user.is_authenticated
+        else None
+    )
+    if page is None:
+        return None
+    content = page[0].replace(
+        PATH_PLACEHOLDER.encode(), escape(request.path).encode()
+    )
+    return HttpResponse(content, status=404)
+
+
+class PrerenderedMixin:
+    """TemplateView, отдающий анонимам страницу, собранную при деплое."""
+
+    prerendered_name = None
+
+    def get(self, request, *args, **kwargs):
+        response = prerendered_response(request, self.prerendered_name)
+        if response is not None:
+            return response
+        return super().get(request, *args, **kwargs)
@@ -0,0 +1,140 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import caches
+from django.shortcuts import render
+from django.utils.module_loading import import_string
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+LOCAL_MAX_KEYS: int = 100000
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60): десять запросов в минуту."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period]
+
+
+def refill(state, capacity, refill_rate, now):
+    """Новое состояние корзины и время до следующего токена."""
+    tokens, updated = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * refill_rate)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), math.ceil((1 - tokens) / refill_rate)
+
+
+class LocalMemoryStore:
+    """Корзины в памяти процесса: O(1) на проверку, без обращений к сети."""
+
+    def __init__(self, max_keys=LOCAL_MAX_KEYS):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def consume(self, key, capacity, refill_rate, now):
+        with self._lock:
+            state, retry_after = refill(
+                self._buckets.pop(key, None), capacity, refill_rate, now
+            )
+            self._buckets[key] = state
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheStore:
+    """Корзины в кэше Django: файловом, в БД или любом другом.
+
+    Чтение и запись не атомарны, так что при гонке пара лишних
+    запросов может пройти; для защиты от ботов этого достаточно.
+    """
+
+    def __init__(self, alias=None):
+        self.alias = alias or settings.RATELIMIT_CACHE_ALIAS
+
+    def consume(self, key, capacity, refill_rate, now):
+        cache = caches[self.alias]
+        state, retry_after = refill(
+            cache.get(key), capacity, refill_rate, now
+        )
+        cache.set(key, state, math.ceil(capacity / refill_rate) + 1)
+        return retry_after
+
+    def clear(self):
+        caches[self.alias].clear()
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = import_string(settings.RATELIMIT_STORE)()
+    return _store
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def key_by_ip(request):
+    return f'ip:{client_ip(request)}'
+
+
+def key_by_user_or_ip(request):
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return key_by_ip(request)
+
+
+def too_many_requests(request, retry_after):
+    response = render(
+        request,
+        'core/429.html',
+        {'retry_after': retry_after},
+        status=HTTPStatus.TOO_MANY_REQUESTS,
+    )
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def ratelimit(rate, key=key_by_user_or_ip, methods=('POST',), burst=None,
+              scope=None):
+    """Ограничивает частоту запросов к view корзиной токенов.
+
+    rate — '10/m', burst — размер корзины (по умолчанию равен rate),
+    scope — общее имя корзины для нескольких view.
+    """
+    count, period = parse_rate(rate)
+    capacity = burst or count
+    refill_rate = count / period
+
+    def decorator(view_func):
+        name = scope or f'{view_func.__module__}.{view_func.__name__}'
+        prefix = f'rl:{name}'
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if settings.RATELIMIT_ENABLED and request.method in methods:
+                retry_after = get_store().consume(
+                    f'{prefix}:{key(request)}',
+                    capacity,
+                    refill_rate,
+                    time.time(),
+                )
+                if retry_after:
+                    return too_many_requests(request, retry_after)
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,79 @@
+import threading
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+from django.utils.encoding import filepath_to_uri
+
+
+@deconstructible
+class InMemoryStorage(Storage):
+    """Хранилище файлов в памяти процесса.
+
+    Нужно тестам: загрузки и миниатюры не трогают диск, а у каждого
+    воркера pytest-xdist свой набор файлов. Содержимое общее для всех
+    экземпляров, поэтому после теста его чистят через ``clear()``.
+    """
+
+    _files = {}
+    _lock = threading.Lock()
+
+    def __init__(self, base_url=None):
+        self.base_url = base_url
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._files.clear()
+
+    def _open(self, name, mode='rb'):
+        with self._lock:
+            content, _ = self._files[name]
+        return ContentFile(content, name=name)
+
+    def _save(self, name, content):
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        data = b''.join(content.chunks())
+        with self._lock:
+            self._files[name] = (data, timezone.now())
+        return name
+
+    def delete(self, name):
+        with self._lock:
+            self._files.pop(name, None)
+
+    def exists(self, name):
+        return name in self._files
+
+    def size(self, name):
+        with self._lock:
+            return len(self._files[name][0])
+
+    def listdir(self, path):
+        prefix = path.rstrip('/') + '/' if path else ''
+        directories, files = set(), []
+        with self._lock:
+            names = list(self._files)
+        for name in names:
+            if not name.startswith(prefix):
+                continue
+            head, _, tail = name[len(prefix):].partition('/')
+            if tail:
+                directories.add(head)
+            else:
+                files.append(head)
+        return sorted(directories), sorted(files)
+
+    def get_modified_time(self, name):
+        with self._lock:
+            return self._files[name][1]
+
+    get_created_time = get_accessed_time = get_modified_time
+
+    def url(self, name):
+        base_url = self.base_url or settings.MEDIA_URL
+        return urljoin(base_url, filepath_to_uri(name))
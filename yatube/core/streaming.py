@@ -0,0 +1,29 @@
+from django.http import StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+# На место этой метки в готовой странице выводятся части потока
+STREAM_MARKER = '<!-- stream -->'
+
+
+def streaming_render(request, template_name, context, parts):
+    """Страница, у которой тяжёлая середина отдаётся по частям.
+
+    Шаблон рисуется один раз с меткой ``{{ stream }}`` вместо списка
+    (карточек, комментариев), а сам список — генератор parts — рисуется
+    уже во время отправки: клиент получает шапку страницы, не дожидаясь
+    последней карточки.
+    """
+    html = render_to_string(
+        template_name,
+        {**context, 'stream': mark_safe(STREAM_MARKER)},
+        request,
+    )
+    head, _, tail = html.partition(STREAM_MARKER)
+
+    def content():
+        yield head
+        yield from parts
+        yield tail
+
+    return StreamingHttpResponse(content())
@@ -0,0 +1,106 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from ..budget import BudgetExceeded, Recorder, overruns, query_budget
+
+User = get_user_model()
+
+
+def count_users(times):
+    for _ in range(times):
+        User.objects.count()
+
+
+@query_budget(queries=2)
+def chatty_view(request):
+    count_users(3)
+    return HttpResponse('ok')
+
+
+@query_budget(queries=2)
+def streaming_view(request):
+    def content():
+        count_users(3)
+        yield 'ok'
+    return StreamingHttpResponse(content())
+
+
+@query_budget(ms=0)
+def slow_view(request):
+    return HttpResponse('ok')
+
+
+@override_settings(BUDGET_STRICT=True)
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+
+    def test_overrun_fails_in_tests(self):
+        """В тестах превышение бюджета — ошибка с источником запросов."""
+        with self.assertRaises(BudgetExceeded) as error:
+            chatty_view(self.request)
+        message = str(error.exception)
+        self.assertIn('3 запросов при бюджете 2', message)
+        self.assertIn('core/tests/test_budget.py', message)
+
+    def test_streaming_content_is_counted(self):
+        """Запросы при отправке потокового ответа тоже считаются."""
+        response = streaming_view(self.request)
+        with self.assertRaises(BudgetExceeded):
+            b''.join(response.streaming_content)
+
+    @override_settings(BUDGET_STRICT=False)
+    def test_overrun_warns_in_production(self):
+        """В работе превышение — предупреждение в лог и счётчик."""
+        before = overruns['core.tests.test_budget.chatty_view']
+        with self.assertLogs('core.budget', 'WARNING'):
+            response = chatty_view(self.request)
+        self.assertEqual(response.content, b'ok')
+        self.assertEqual(
+            overruns['core.tests.test_budget.chatty_view'], before + 1
+        )
+
+    @override_settings(BUDGET_STRICT=False)
+    def test_production_traces_only_overrun(self):
+        """В работе стек обходится только для запросов сверх бюджета."""
+        with self.assertLogs('core.budget', 'WARNING') as logs:
+            chatty_view(self.request)
+        self.assertIn('Запросы сверх бюджета', logs.output[0])
+        self.assertIn('core/tests/test_budget.py', logs.output[0])
+        recorder = Recorder(budget=2)
+        with connection.execute_wrapper(recorder):
+            count_users(3)
+        self.assertEqual(recorder.count, 3)
+        self.assertEqual(sum(recorder.origins.values()), 1)
+
+    def test_time_overrun_only_logged(self):
+        """Превышение по времени в тестах не ошибка, а запись в лог."""
+        with self.assertLogs('core.budget', 'WARNING') as logs:
+            response = slow_view(self.request)
+        self.assertEqual(response.content, b'ok')
+        self.assertIn('мс при бюджете 0 мс', logs.output[0])
+
+    def test_template_line_is_reported(self):
+        """Запрос из шаблона называется строкой шаблона."""
+        user = User.objects.create_user(username='author')
+        client = Client()
+        client.force_login(user)
+
+        @query_budget(queries=0)
+        def view(request):
+            return client.get(reverse('posts:index'))
+
+        with self.assertRaisesRegex(BudgetExceeded, r'header\.html:\d+'):
+            view(self.request)
+
+    def test_signup_within_budget(self):
+        """Регистрация укладывается в бюджет запросов."""
+        response = Client().post(reverse('users:signup'), {
+            'username': 'new',
+            'password1': 'Xq7-secret-pass',
+            'password2': 'Xq7-secret-pass',
+        })
+        self.assertRedirects(response, reverse('posts:index'))
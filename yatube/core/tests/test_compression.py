@@ -0,0 +1,55 @@
+import gzip
+import zlib
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..middleware import CompressionMiddleware, compress_gzip_sequence
+
+TEXT = 'Текст страницы. ' * 200
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.middleware = CompressionMiddleware()
+        self.request = RequestFactory().get(
+            '/', HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+
+    def test_compresses_long_html(self):
+        """Длинный HTML сжимается, ETag становится слабым."""
+        response = HttpResponse(TEXT)
+        response['ETag'] = '"etag"'
+        response = self.middleware.process_response(self.request, response)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['ETag'], 'W/"etag"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content).decode(), TEXT)
+
+    @override_settings(COMPRESS_MIN_LENGTH=1024)
+    def test_skips_short_and_binary(self):
+        """Короткие ответы и картинки не сжимаются."""
+        responses = (
+            HttpResponse('Коротко'),
+            HttpResponse(b'\0' * 5000, content_type='image/png'),
+        )
+        for response in responses:
+            with self.subTest(content_type=response['Content-Type']):
+                response = self.middleware.process_response(
+                    self.request, response
+                )
+                self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_streaming_is_flushed(self):
+        """Каждая часть потока выходит сразу, а не в конце ответа."""
+        parts = iter(compress_gzip_sequence(iter([b'head', b'tail'])))
+        header = next(parts)
+        first = next(parts)
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self.assertEqual(decompressor.decompress(header + first), b'head')
+        response = StreamingHttpResponse(iter([TEXT] * 3))
+        response = self.middleware.process_response(self.request, response)
+        self.assertEqual(
+            gzip.decompress(b''.join(response.streaming_content)).decode(),
+            TEXT * 3,
+        )
@@ -0,0 +1,164 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..mail import MailQueue, mail_queue
+from ..ratelimit import get_store
+
+User = get_user_model()
+SLOW_DELIVERY: float = 0.3
+WAIT_TIMEOUT: float = 5.0
+BROKEN_ADDRESS = 'broken@example.com'
+
+
+class CountingBackend(EmailBackend):
+    connections = 0
+    failures = 0
+
+    def open(self):
+        CountingBackend.connections += 1
+        if CountingBackend.failures:
+            CountingBackend.failures -= 1
+            raise ConnectionError
+        return True
+
+
+class SlowBackend(EmailBackend):
+    def send_messages(self, messages):
+        time.sleep(SLOW_DELIVERY)
+        return super().send_messages(messages)
+
+
+class BrokenRecipientBackend(EmailBackend):
+    """Не может доставить письма на BROKEN_ADDRESS, пока failures > 0."""
+    failures = 0
+
+    def send_messages(self, messages):
+        for message in messages:
+            if BROKEN_ADDRESS in message.to and self.failures:
+                BrokenRecipientBackend.failures -= 1
+                raise ConnectionError
+        return super().send_messages(messages)
+
+
+def make_messages(count):
+    return [
+        EmailMessage('Тема', 'Текст', to=[f'user{number}@example.com'])
+        for number in range(count)
+    ]
+
+
+def wait_for_outbox(count, timeout=WAIT_TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while len(mail.outbox) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return len(mail.outbox)
+
+
+@override_settings(EMAIL_QUEUE_BACKEND='core.tests.test_mail.CountingBackend')
+class MailQueueTests(TestCase):
+    def setUp(self):
+        CountingBackend.connections = 0
+        CountingBackend.failures = 0
+        BrokenRecipientBackend.failures = 0
+
+    def test_batch_over_one_connection(self):
+        """Пачка писем уходит через одно соединение."""
+        queue = MailQueue(batch_size=10, batch_wait=1)
+        queue.put(make_messages(10))
+        queue.join()
+        self.assertEqual(len(mail.outbox), 10)
+        self.assertEqual(CountingBackend.connections, 1)
+
+    def test_retry_with_backoff(self):
+        """Сбой доставки повторяется с растущей паузой."""
+        CountingBackend.failures = 2
+        queue = MailQueue(backoff=0.01, batch_wait=0)
+        with self.assertLogs('core.mail', 'WARNING'):
+            queue.put(make_messages(1))
+            queue.join()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(CountingBackend.connections, 3)
+        self.assertEqual(
+            [queue.retry_delay(attempt) for attempt in range(3)],
+            [0.01, 0.02, 0.04],
+        )
+
+    def test_gives_up_after_retries(self):
+        """После исчерпания попыток письма не отправляются."""
+        CountingBackend.failures = 10
+        queue = MailQueue(retries=2, backoff=0, batch_wait=0)
+        with self.assertLogs('core.mail', 'ERROR'):
+            queue.put(make_messages(1))
+            queue.join()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(CountingBackend.connections, 3)
+
+    @override_settings(
+        EMAIL_QUEUE_BACKEND='core.tests.test_mail.BrokenRecipientBackend'
+    )
+    def test_retry_resends_only_unsent(self):
+        """После обрыва посреди пачки повторяются только неотправленные."""
+        BrokenRecipientBackend.failures = 1
+        messages = make_messages(3)
+        messages[1].to = [BROKEN_ADDRESS]
+        queue = MailQueue(backoff=0)
+        with self.assertLogs('core.mail', 'WARNING'):
+            self.assertEqual(queue.deliver(messages), messages[1:])
+        self.assertEqual(queue.deliver(messages[1:]), [])
+        self.assertEqual(
+            [message.to for message in mail.outbox],
+            [message.to for message in messages],
+        )
+
+    @override_settings(
+        EMAIL_QUEUE_BACKEND='core.tests.test_mail.BrokenRecipientBackend'
+    )
+    def test_retry_does_not_block_other_mail(self):
+        """Пока письмо ждёт повтора, остальная почта уходит."""
+        BrokenRecipientBackend.failures = 1
+        broken = EmailMessage('Тема', 'Текст', to=[BROKEN_ADDRESS])
+        queue = MailQueue(batch_size=1, batch_wait=0.01, backoff=60)
+        with self.assertLogs('core.mail', 'WARNING'):
+            queue.put([broken])
+            queue.put(make_messages(1))
+            self.assertEqual(wait_for_outbox(1), 1)
+        self.assertEqual(mail.outbox[0].to, ['user0@example.com'])
+        # при остановке процесса отложенное письмо уходит без паузы
+        self.assertTrue(queue.drain(timeout=WAIT_TIMEOUT))
+        self.assertEqual(mail.outbox[1].to, [BROKEN_ADDRESS])
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.QueuedEmailBackend',
+    EMAIL_QUEUE_BACKEND='core.tests.test_mail.SlowBackend',
+)
+class PasswordResetMailTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='author', email='author@example.com', password='pass'
+        )
+
+    def setUp(self):
+        get_store().clear()
+
+    def test_reset_does_not_wait_for_delivery(self):
+        """Ответ на сброс пароля не ждёт доставки письма."""
+        start = time.perf_counter()
+        response = Client().post(
+            reverse('users:password_reset_form'),
+            {'email': 'author@example.com'},
+        )
+        elapsed = time.perf_counter() - start
+        self.assertEqual(response.status_code, 302)
+        self.assertLess(elapsed, SLOW_DELIVERY)
+        mail_queue.join()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['author@example.com'])
@@ -0,0 +1,51 @@
+from django.test import SimpleTestCase
+
+from ..objcache import ObjectCache
+
+
+class ObjectCacheTests(SimpleTestCase):
+    def test_hit_returns_copy(self):
+        """Попадание отдаёт копию: правка не портит запись в кэше."""
+        cache = ObjectCache(max_bytes=10000, ttl=60)
+        cache.set('key', {'title': 'Группа'}, now=0)
+        cached = cache.get('key', now=1)
+        cached['title'] = 'Изменено'
+        self.assertEqual(cache.get('key', now=2), {'title': 'Группа'})
+        self.assertIsNone(cache.get('other', now=2))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3)
+
+    def test_ttl(self):
+        """Запись устаревает через ttl секунд."""
+        cache = ObjectCache(max_bytes=10000, ttl=60)
+        cache.set('key', 'value', now=0)
+        self.assertEqual(cache.get('key', now=59), 'value')
+        self.assertIsNone(cache.get('key', now=60))
+        self.assertEqual(cache.stats()['bytes'], 0)
+
+    def test_byte_limit_evicts_least_recently_used(self):
+        """При переполнении вытесняются давно не читанные записи."""
+        entry = 'x' * 100
+        cache = ObjectCache(max_bytes=250, ttl=60)
+        cache.set('a', entry, now=0)
+        cache.set('b', entry, now=0)
+        cache.get('a', now=1)
+        cache.set('c', entry, now=2)
+        self.assertIsNone(cache.get('b', now=3))
+        self.assertEqual(cache.get('a', now=3), entry)
+        self.assertLessEqual(cache.stats()['bytes'], 250)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        cache.set('huge', 'x' * 1000, now=4)
+        self.assertIsNone(cache.get('huge', now=4))
+
+    def test_invalidate_by_tag(self):
+        """Сброс по тегу убирает все ключи объекта."""
+        cache = ObjectCache(max_bytes=10000, ttl=60)
+        cache.set('pk', 'group', tags=('group:1',), now=0)
+        cache.set('slug', 'group', tags=('group:1',), now=0)
+        cache.set('other', 'group', tags=('group:2',), now=0)
+        cache.invalidate('group:1')
+        self.assertIsNone(cache.get('pk', now=1))
+        self.assertIsNone(cache.get('slug', now=1))
+        self.assertEqual(cache.get('other', now=1), 'group')
@@ -0,0 +1,85 @@
+import shutil
+import tempfile
+from http import HTTPStatus
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+
+from ..prerender import load_page
+
+User = get_user_model()
+TEMP_PRERENDER_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(
+    PRERENDER_ENABLED=True, PRERENDER_ROOT=TEMP_PRERENDER_ROOT
+)
+class PrerenderTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        load_page.cache_clear()
+        shutil.rmtree(TEMP_PRERENDER_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        call_command('prerender', stdout=StringIO())
+        self.guest_client = Client()
+
+    def test_about_served_without_templates(self):
+        """Страницы about отдаются из файла с кэшем и ETag."""
+        for url in ('/about/author/', '/about/tech/'):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(response.templates, [])
+                self.assertIn('max-age=', response['Cache-Control'])
+                self.assertTrue(response['ETag'].startswith('"'))
+                self.assertContains(response, 'active')
+
+    def test_etag_revalidation(self):
+        """Совпавший If-None-Match даёт 304 без тела."""
+        etag = self.guest_client.get('/about/author/')['ETag']
+        response = self.guest_client.get(
+            '/about/author/', HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_etag_revalidation_after_compression(self):
+        """Слабый ETag сжатого ответа тоже даёт 304."""
+        compressed = self.guest_client.get(
+            '/about/author/', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertTrue(compressed['ETag'].startswith('W/'))
+        response = self.guest_client.get(
+            '/about/author/',
+            HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=compressed['ETag'],
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_authorized_user_gets_live_page(self):
+        """Авторизованному пользователю страница рендерится как раньше."""
+        client = Client()
+        client.force_login(self.user)
+        response = client.get('/about/author/')
+        self.assertTemplateUsed(response, 'about/author.html')
+
+    def test_not_found_substitutes_path(self):
+        """Готовая 404 показывает запрошенный адрес."""
+        response = self.guest_client.get('/group/<missing>/')
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertEqual(response.templates, [])
+        self.assertContains(
+            response, '/group/&lt;missing&gt;/', status_code=404
+        )
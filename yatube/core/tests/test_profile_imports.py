@@ -0,0 +1,44 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from ..management.commands.profile_imports import (
+    Command, group_by_package, parse_importtime,
+)
+
+IMPORTTIME_OUTPUT = '''\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     PIL._imaging
+import time:      2900 |       3020 |   PIL.Image
+import time:       300 |       3320 | PIL
+some warning
+'''
+
+
+class ProfileImportsTests(SimpleTestCase):
+    def test_parse_importtime(self):
+        """Заголовок и посторонние строки пропускаются."""
+        modules = parse_importtime(IMPORTTIME_OUTPUT)
+        self.assertEqual(modules, [
+            ('PIL._imaging', 120, 120),
+            ('PIL.Image', 2900, 3020),
+            ('PIL', 300, 3320),
+        ])
+        self.assertEqual(group_by_package(modules), [('PIL', 3320)])
+
+    def test_setup_defers_heavy_imports(self):
+        """django.setup() не тянет Pillow, sorl-thumbnail и модули админки."""
+        modules, _ = Command().run({'command': [], 'wsgi': False})
+        names = {name for name, _, _ in modules}
+        self.assertIn('posts.signals', names)
+        for lazy in ('PIL.Image', 'posts.renditions', 'posts.admin'):
+            with self.subTest(module=lazy):
+                self.assertNotIn(lazy, names)
+
+    def test_command_report(self):
+        """Команда печатает итог и таблицы пакетов и модулей."""
+        out = StringIO()
+        call_command('profile_imports', '--limit', '3', stdout=out)
+        self.assertIn('Запуск:', out.getvalue())
+        self.assertIn('django', out.getvalue())
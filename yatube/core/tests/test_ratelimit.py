@@ -0,0 +1,90 @@
+import time
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..ratelimit import (CacheStore, LocalMemoryStore, get_store,
+                         parse_rate)
+
+User = get_user_model()
+CHECKS: int = 10000
+
+
+class TokenBucketTests(TestCase):
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('10/m'), (10, 60))
+        self.assertEqual(parse_rate('5/s'), (5, 1))
+
+    def test_stores_refill(self):
+        """Корзина пустеет за capacity запросов и пополняется со временем."""
+        for store in (LocalMemoryStore(), CacheStore()):
+            with self.subTest(store=type(store).__name__):
+                store.clear()
+                for _ in range(3):
+                    self.assertEqual(store.consume('key', 3, 1, 100.0), 0)
+                self.assertEqual(store.consume('key', 3, 1, 100.0), 1)
+                self.assertEqual(store.consume('key', 3, 1, 101.0), 0)
+                self.assertEqual(store.consume('other', 3, 1, 101.0), 0)
+
+    def test_local_store_is_bounded(self):
+        """Локальное хранилище не растёт больше max_keys."""
+        store = LocalMemoryStore(max_keys=2)
+        for key in ('a', 'b', 'c'):
+            store.consume(key, 1, 1, 0.0)
+        self.assertEqual(list(store._buckets), ['b', 'c'])
+
+    def test_local_check_is_cheap(self):
+        """Проверка в локальном хранилище укладывается в микросекунды."""
+        store = LocalMemoryStore()
+        start = time.perf_counter()
+        for number in range(CHECKS):
+            store.consume(f'ip:{number % 100}', 10 ** 9, 1, 0.0)
+        per_check = (time.perf_counter() - start) / CHECKS
+        self.assertLess(per_check, 50e-6)
+
+
+class RateLimitedViewsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+
+    def setUp(self):
+        # Корзины живут в памяти процесса: не оставляем их другим тестам
+        get_store().clear()
+        self.addCleanup(get_store().clear)
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_login_limited_with_retry_after(self):
+        """Подбор пароля упирается в 429 с заголовком Retry-After."""
+        url = reverse('users:login')
+        data = {'username': 'author', 'password': 'wrong'}
+        for _ in range(10):
+            response = self.guest_client.post(url, data)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+        response = self.guest_client.post(url, data)
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertTemplateUsed(response, 'core/429.html')
+
+    def test_get_requests_not_limited(self):
+        """GET-запросы не расходуют токены."""
+        for _ in range(30):
+            response = self.authorized_client.get(
+                reverse('posts:post_create')
+            )
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_post_create_limited_per_user(self):
+        """Создание постов ограничено для каждого пользователя."""
+        url = reverse('posts:post_create')
+        for _ in range(20):
+            self.authorized_client.post(url, {'text': 'Пост'})
+        response = self.authorized_client.post(url, {'text': 'Пост'})
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
@@ -2,8 +2,13 @@ from http import HTTPStatus
 
 from django.shortcuts import render
 
+from .prerender import prerendered_not_found
+
 
 def page_not_found(request, exception):
+    response = prerendered_not_found(request)
+    if response is not None:
+        return response
     template = 'core/404.html'
     context = {'path': request.path}
     status = HTTPStatus.NOT_FOUND
@@ -1,14 +1,158 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.db.models.functions import Substr
 
-from .models import Group, Post
+from core.paginator import EstimatedCountPaginator
+
+from .caches import get_group_choices, invalidate_group_choices
+from .jobs import start_job
+from .models import BulkJob, Group, Post
+from .revisions import post_state, record_revision
+from .signals import posts_changed
+from .tombstones import delete_post, delete_posts
+
+ADMIN_TEXT_LENGTH: int = 50
+
+
+class CachedAutocompleteSelect(AutocompleteSelect):
+    """Autocomplete, берущий подпись выбранного значения из кэша.
+
+    Стандартный виджет делает запрос к БД на каждую строку changelist.
+    """
+
+    def __init__(self, *args, labels=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.labels = labels or {}
+
+    def optgroups(self, name, value, attr=None):
+        missing = [
+            option_value for option_value in value
+            if option_value and str(option_value) not in self.labels
+        ]
+        if missing:
+            # Группа создана в другом процессе или в обход сигналов:
+            # без option сохранение changelist молча обнулило бы её
+            self.labels.update(
+                (str(obj.pk), str(obj))
+                for obj in self.choices.queryset.filter(pk__in=missing)
+            )
+            invalidate_group_choices()
+        default = (None, [], 0)
+        if not self.is_required:
+            default[1].append(self.create_option(name, '', '', False, 0))
+        for option_value in value:
+            label = self.labels.get(str(option_value))
+            if label is None:
+                continue
+            default[1].append(self.create_option(
+                name, option_value, label, True, len(default[1])
+            ))
+        return [default]
+
+
+class PostActionForm(ActionForm):
+    target_group = forms.ModelChoiceField(
+        queryset=Group.objects.all(),
+        required=False,
+        label='Группа',
+    )
 
 
 class PostAdmin(admin.ModelAdmin):
     list_display = ('pk', 'text', 'pub_date', 'author', 'group')
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
     list_editable = ('group',)
+    autocomplete_fields = ('author', 'group')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    action_form = PostActionForm
+    actions = ('move_to_group', 'delete_in_background', 'purge_authors')
+
+    def get_list_display(self, request):
+        # В changelist вместо полного текста выводится его начало,
+        # посчитанное в БД: сам text в выборку не попадает.
+        return tuple(
+            'short_text' if name == 'text' else name
+            for name in super().get_list_display(request)
+        )
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            short_text=Substr('text', 1, ADMIN_TEXT_LENGTH)
+        ).defer('text')
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        old_state = post_state(Post.objects.get(pk=obj.pk))
+        super().save_model(request, obj, form, change)
+        record_revision(obj, old_state, editor=request.user)
+
+    def delete_model(self, request, obj):
+        delete_post(obj)
+
+    def delete_queryset(self, request, queryset):
+        post_ids = list(queryset.values_list('pk', flat=True))
+        delete_posts(post_ids)
+        posts_changed.send(sender=Post, post_ids=post_ids)
+
+    def get_changelist_formset(self, request, **kwargs):
+        group_field = Post._meta.get_field('group')
+        kwargs.setdefault('widgets', {})['group'] = CachedAutocompleteSelect(
+            group_field.remote_field,
+            self.admin_site,
+            labels=get_group_choices(),
+        )
+        return super().get_changelist_formset(request, **kwargs)
+
+    def short_text(self, obj):
+        return obj.short_text
+    short_text.short_description = 'Текст поста'
+    short_text.admin_order_field = 'text'
+
+    def _start_job(self, request, action, object_ids, **kwargs):
+        job = start_job(action, object_ids, user=request.user, **kwargs)
+        self.message_user(
+            request,
+            f'Задача «{job}» поставлена в очередь: {job.total} объектов. '
+            f'Прогресс — в разделе «Фоновые задачи».',
+        )
+
+    def move_to_group(self, request, queryset):
+        target_group = self.action_form.base_fields['target_group'].clean(
+            request.POST.get('target_group')
+        )
+        if target_group is None:
+            self.message_user(
+                request, 'Выберите группу для переноса.', messages.WARNING
+            )
+            return
+        self._start_job(
+            request,
+            BulkJob.MOVE,
+            queryset.values_list('pk', flat=True),
+            target_group=target_group,
+        )
+    move_to_group.short_description = 'Перенести в выбранную группу'
+
+    def delete_in_background(self, request, queryset):
+        self._start_job(
+            request, BulkJob.DELETE, queryset.values_list('pk', flat=True)
+        )
+    delete_in_background.short_description = 'Удалить пачками в фоне'
+
+    def purge_authors(self, request, queryset):
+        self._start_job(
+            request,
+            BulkJob.PURGE,
+            queryset.order_by().values_list('author_id', flat=True).distinct(),
+        )
+    purge_authors.short_description = 'Удалить все посты и комментарии авторов'
 
 
 class GroupAdmin(admin.ModelAdmin):
@@ -17,5 +161,23 @@ class GroupAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
+class BulkJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk', 'action', 'status', 'progress', 'processed', 'total',
+        'created_by', 'created', 'finished',
+    )
+    list_filter = ('status', 'action')
+    list_select_related = ('created_by',)
+    readonly_fields = [field.name for field in BulkJob._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def progress(self, obj):
+        return f'{obj.progress}%'
+    progress.short_description = 'Прогресс'
+
+
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group, GroupAdmin)
+admin.site.register(BulkJob, BulkJobAdmin)
@@ -0,0 +1,121 @@
+import datetime
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import MonthlyPostCount, Post
+from .routes import posts_reverse
+
+ALL_SCOPE = 'all'
+
+
+def group_scope(group_id):
+    return f'group:{group_id}'
+
+
+def author_scope(author_id):
+    return f'author:{author_id}'
+
+
+def post_month(pub_date):
+    if timezone.is_aware(pub_date):
+        pub_date = timezone.localtime(pub_date)
+    return pub_date.year, pub_date.month
+
+
+def post_buckets(group_id, author_id, pub_date):
+    """Корзины (лента, год, месяц), в которые попадает пост."""
+    year, month = post_month(pub_date)
+    scopes = [ALL_SCOPE, author_scope(author_id)]
+    if group_id is not None:
+        scopes.append(group_scope(group_id))
+    return [(scope, year, month) for scope in scopes]
+
+
+def apply_deltas(deltas):
+    """Прибавляет {(лента, год, месяц): изменение} к счётчикам месяцев."""
+    for (scope, year, month), delta in deltas.items():
+        if not delta:
+            continue
+        buckets = MonthlyPostCount.objects.filter(
+            scope=scope, year=year, month=month
+        )
+        if buckets.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                MonthlyPostCount.objects.create(
+                    scope=scope, year=year, month=month, count=delta
+                )
+        except IntegrityError:
+            # корзину успел создать параллельный запрос
+            buckets.update(count=F('count') + delta)
+
+
+def update_buckets(old, new):
+    """Переносит пост между корзинами.
+
+    old — None у нового поста, new — None у удалённого.
+    """
+    deltas = Counter()
+    if old is not None:
+        deltas.subtract(post_buckets(*old))
+    if new is not None:
+        deltas.update(post_buckets(*new))
+    apply_deltas(deltas)
+
+
+def remove_posts(values):
+    """Убирает из корзин посты по их (group_id, author_id, pub_date)."""
+    deltas = Counter()
+    for post_values in values:
+        deltas.subtract(post_buckets(*post_values))
+    apply_deltas(deltas)
+
+
+def move_posts(post_ids, target_group_id):
+    """Корзины групп для массового переноса постов через update()."""
+    deltas = Counter()
+    for group_id, pub_date in Post.objects.filter(
+        pk__in=post_ids
+    ).values_list('group_id', 'pub_date'):
+        if group_id == target_group_id:
+            continue
+        year, month = post_month(pub_date)
+        if group_id is not None:
+            deltas[(group_scope(group_id), year, month)] -= 1
+        if target_group_id is not None:
+            deltas[(group_scope(target_group_id), year, month)] += 1
+    apply_deltas(deltas)
+
+
+def rebuild_archive():
+    """Пересчитывает все корзины с нуля одним проходом по постам."""
+    deltas = Counter()
+    for values in Post.objects.values_list(
+        'group_id', 'author_id', 'pub_date'
+    ).iterator():
+        deltas.update(post_buckets(*values))
+    with transaction.atomic():
+        MonthlyPostCount.objects.all().delete()
+        MonthlyPostCount.objects.bulk_create(
+            MonthlyPostCount(scope=scope, year=year, month=month, count=count)
+            for (scope, year, month), count in deltas.items()
+        )
+    return len(deltas)
+
+
+def archive_links(scope, route, *args):
+    """Месяцы ленты со счётчиками и ссылками для боковой панели."""
+    return [
+        {
+            'date': datetime.date(year, month, 1),
+            'count': count,
+            'url': posts_reverse(route, *args, year, month),
+        }
+        for year, month, count in MonthlyPostCount.objects.filter(
+            scope=scope, count__gt=0
+        ).values_list('year', 'month', 'count')
+    ]
@@ -0,0 +1,21 @@
+from django.core.cache import cache
+
+from .models import Group
+
+GROUP_CHOICES_CACHE_KEY = 'posts:group_choices'
+
+
+def get_group_choices():
+    """Словарь {pk: title} всех групп, общий для всех строк changelist."""
+    choices = cache.get(GROUP_CHOICES_CACHE_KEY)
+    if choices is None:
+        choices = {
+            str(pk): title
+            for pk, title in Group.objects.values_list('pk', 'title')
+        }
+        cache.set(GROUP_CHOICES_CACHE_KEY, choices)
+    return choices
+
+
+def invalidate_group_choices():
+    cache.delete(GROUP_CHOICES_CACHE_KEY)
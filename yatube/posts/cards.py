@@ -0,0 +1,44 @@
+from .renditions import image_contexts
+from .routes import posts_reverse
+
+
+def build_cards(posts):
+    """Готовый контекст карточек для всей страницы ленты.
+
+    Ссылки и картинки считаются здесь пачкой, а шаблону карточки
+    остаётся только подставить строки.
+    """
+    posts = list(posts)
+    images = image_contexts(post.image for post in posts)
+    return [
+        {
+            'post': post,
+            'author_name': post.author.get_full_name(),
+            'profile_url': posts_reverse('profile', post.author.username),
+            'detail_url': posts_reverse('post_detail', post.pk),
+            'group_url': posts_reverse(
+                'group_list', post.group.slug
+            ) if post.group_id else None,
+            'image': images.get(post.image.name),
+        }
+        for post in posts
+    ]
+
+
+def build_feed_cards(items):
+    """Карточки из строк FeedItem: всё уже лежит в самой строке."""
+    items = list(items)
+    images = image_contexts(item.image for item in items)
+    return [
+        {
+            'post': item,
+            'author_name': item.author_full_name,
+            'profile_url': posts_reverse('profile', item.author_username),
+            'detail_url': posts_reverse('post_detail', item.post_id),
+            'group_url': posts_reverse(
+                'group_list', item.group_slug
+            ) if item.group_id else None,
+            'image': images.get(item.image.name),
+        }
+        for item in items
+    ]
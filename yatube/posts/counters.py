@@ -0,0 +1,104 @@
+import logging
+import random
+import threading
+import time
+from collections import Counter
+
+from django.db.models import F, FloatField, PositiveIntegerField
+
+from core.db import case_by_pk
+
+from .models import Post
+from .trending import VIEW_WEIGHT
+
+logger = logging.getLogger(__name__)
+
+VIEWS_FLUSH_SIZE: int = 500
+VIEWS_FLUSH_INTERVAL: float = 30.0
+# Когда у поста в буфере набралось столько просмотров, дальше
+# учитывается только каждый SAMPLE_RATE-й с весом 1 / SAMPLE_RATE.
+HOT_POST_THRESHOLD: int = 100
+SAMPLE_RATE: float = 0.1
+
+
+def write_views(counts):
+    """Один UPDATE ... CASE для всех постов из буфера."""
+    return Post.objects.filter(pk__in=counts).update(
+        views=F('views') + case_by_pk(counts, PositiveIntegerField()),
+        score=F('score') + case_by_pk(
+            {pk: count * VIEW_WEIGHT for pk, count in counts.items()},
+            FloatField(),
+            0.0,
+        ),
+    )
+
+
+class ViewCounter:
+    """Буфер просмотров в памяти процесса, сбрасываемый пачками."""
+
+    def __init__(self, writer=write_views, flush_size=VIEWS_FLUSH_SIZE,
+                 flush_interval=VIEWS_FLUSH_INTERVAL,
+                 hot_threshold=HOT_POST_THRESHOLD, sample_rate=SAMPLE_RATE,
+                 rng=random.random):
+        self.writer = writer
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.hot_threshold = hot_threshold
+        self.sample_rate = sample_rate
+        self.rng = rng
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._hits = 0
+        self._last_flush = time.monotonic()
+
+    def hit(self, post_id):
+        with self._lock:
+            if self._counts[post_id] < self.hot_threshold:
+                self._counts[post_id] += 1
+            elif self.rng() < self.sample_rate:
+                self._counts[post_id] += round(1 / self.sample_rate)
+            self._hits += 1
+            due = (
+                self._hits >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.try_flush()
+
+    def pending(self, post_id):
+        with self._lock:
+            return self._counts[post_id]
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._hits = 0
+            self._last_flush = time.monotonic()
+        if not counts:
+            return 0
+        try:
+            self.writer(dict(counts))
+        except Exception:
+            # Не теряем просмотры: вернём их в буфер до следующей попытки
+            with self._lock:
+                self._counts.update(counts)
+            raise
+        return sum(counts.values())
+
+    def try_flush(self):
+        """flush, который не роняет запрос: ошибка только пишется в лог.
+
+        Просмотры остаются в буфере и уйдут со следующим сбросом, когда
+        снова наберётся flush_size хитов или пройдёт flush_interval.
+        """
+        try:
+            return self.flush()
+        except Exception:
+            logger.exception('Не удалось записать просмотры постов')
+            return 0
+
+
+# При штатной остановке веб-процесса буфер сбрасывается через atexit
+# (yatube/wsgi.py); при аварийной теряется не больше VIEWS_FLUSH_INTERVAL
+# секунд просмотров: для счётчика это дешевле, чем запись на каждый хит.
+view_counter = ViewCounter()
@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from core.paginator import ElidedPaginator
+
+from .models import Group, Post
+
+GROUPS_PER_PAGE: int = 50
+GROUP_DIRECTORY_CACHE_PREFIX = 'posts:group_directory:'
+GROUP_DIRECTORY_VERSION_KEY = GROUP_DIRECTORY_CACHE_PREFIX + 'version'
+GROUP_DIRECTORY_CACHE_TIMEOUT: int = 60 * 10
+
+
+def group_directory():
+    """Группы со сводкой по постам одним запросом.
+
+    Коррелированные подзапросы вместо JOIN + GROUP BY: база считает их
+    только для групп текущей страницы, а не агрегирует все посты сразу.
+    Оба подзапроса идут по индексу (group, -pub_date).
+    """
+    posts = Post.objects.filter(group=OuterRef('pk'))
+    latest = posts.order_by('-pub_date')
+    posts_count = posts.order_by().values('group').annotate(
+        count=Count('pk')
+    ).values('count')
+    return Group.objects.order_by('title', 'pk').annotate(
+        posts_count=Coalesce(
+            Subquery(posts_count, output_field=IntegerField()), 0
+        ),
+        last_pub_date=Subquery(latest.values('pub_date')[:1]),
+        last_author=Subquery(latest.values('author__username')[:1]),
+    ).values(
+        'title', 'slug', 'posts_count', 'last_pub_date', 'last_author'
+    )
+
+
+def directory_version():
+    version = cache.get(GROUP_DIRECTORY_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(GROUP_DIRECTORY_VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_group_directory():
+    """Все закэшированные страницы устаревают разом: меняется версия."""
+    try:
+        cache.incr(GROUP_DIRECTORY_VERSION_KEY)
+    except ValueError:
+        cache.set(GROUP_DIRECTORY_VERSION_KEY, 1, None)
+
+
+def group_directory_page(page_number, per_page=GROUPS_PER_PAGE):
+    """Страница каталога групп; число групп и строки берутся из кэша."""
+    prefix = f'{GROUP_DIRECTORY_CACHE_PREFIX}{directory_version()}:'
+    paginator = ElidedPaginator(group_directory(), per_page)
+    count = cache.get(prefix + 'count')
+    if count is None:
+        count = paginator.count
+        cache.set(prefix + 'count', count, GROUP_DIRECTORY_CACHE_TIMEOUT)
+    # count — cached_property: значение из кэша избавляет от COUNT(*)
+    paginator.count = count
+    page_obj = paginator.get_page(page_number)
+    page_key = f'{prefix}page:{page_obj.number}'
+    groups = cache.get(page_key)
+    if groups is None:
+        groups = list(page_obj.object_list)
+        cache.set(page_key, groups, GROUP_DIRECTORY_CACHE_TIMEOUT)
+    page_obj.object_list = groups
+    page_obj.page_links = paginator.get_elided_page_range(page_obj.number)
+    return page_obj
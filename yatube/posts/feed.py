@@ -0,0 +1,73 @@
+from django.db import transaction
+
+from .models import FeedItem, Post
+
+FEED_REBUILD_BATCH_SIZE: int = 500
+
+
+def feed_item(post):
+    """Строка ленты поста; автор и группа должны быть подгружены."""
+    return FeedItem(
+        post_id=post.pk,
+        pub_date=post.pub_date,
+        text=post.text,
+        image=post.image.name or '',
+        author_id=post.author_id,
+        author_username=post.author.username,
+        author_full_name=post.author.get_full_name(),
+        group_id=post.group_id,
+        group_slug=post.group.slug if post.group_id else '',
+    )
+
+
+def sync_feed_items(post_ids):
+    """Пересобирает строки ленты постов после правки, переноса, удаления.
+
+    Удалённые посты не проходят фильтр менеджера, поэтому их строки
+    просто исчезают.
+    """
+    post_ids = list(post_ids)
+    with transaction.atomic():
+        FeedItem.objects.filter(post_id__in=post_ids).delete()
+        FeedItem.objects.bulk_create(
+            feed_item(post) for post in Post.objects.filter(
+                pk__in=post_ids
+            ).select_related('author', 'group')
+        )
+
+
+def rename_author(user):
+    FeedItem.objects.filter(author=user).exclude(
+        author_username=user.username,
+        author_full_name=user.get_full_name(),
+    ).update(
+        author_username=user.username,
+        author_full_name=user.get_full_name(),
+    )
+
+
+def rename_group(group):
+    FeedItem.objects.filter(group=group).exclude(
+        group_slug=group.slug
+    ).update(group_slug=group.slug)
+
+
+def detach_group(group):
+    # посты группы отвязываются через UPDATE без сигналов
+    FeedItem.objects.filter(group=group).update(group=None, group_slug='')
+
+
+def rebuild_feed(batch_size=FEED_REBUILD_BATCH_SIZE):
+    """Заполняет таблицу ленты заново одним проходом по постам."""
+    posts = Post.objects.select_related('author', 'group').iterator()
+    created = 0
+    with transaction.atomic():
+        FeedItem.objects.all().delete()
+        batch = []
+        for post in posts:
+            batch.append(feed_item(post))
+            if len(batch) == batch_size:
+                created += len(FeedItem.objects.bulk_create(batch))
+                batch = []
+        created += len(FeedItem.objects.bulk_create(batch))
+    return created
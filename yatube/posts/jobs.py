@@ -0,0 +1,132 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from . import archive, tombstones
+from .models import BulkJob, Comment, Post
+from .signals import posts_changed
+
+logger = logging.getLogger(__name__)
+
+JOB_CHUNK_SIZE: int = 200
+STALE_JOB_ERROR = 'Прервана перезапуском процесса, запустите заново.'
+
+# Один воркер: задачи выполняются по очереди и не конкурируют
+# за единственного писателя SQLite.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bulk-job')
+
+
+def chunked(items, size=JOB_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def move_posts(job, post_ids):
+    for chunk in chunked(post_ids):
+        with transaction.atomic():
+            archive.move_posts(chunk, job.target_group_id)
+            Post.objects.filter(pk__in=chunk).update(
+                group_id=job.target_group_id
+            )
+        yield len(chunk), chunk
+
+
+def delete_posts(job, post_ids):
+    for chunk in chunked(post_ids):
+        tombstones.delete_posts(chunk)
+        yield len(chunk), chunk
+
+
+def delete_comments(job, comment_ids):
+    for chunk in chunked(comment_ids):
+        yield len(chunk), tombstones.delete_comments(chunk)
+
+
+def purge_authors(job, author_ids):
+    comment_ids = list(
+        Comment.objects.filter(author_id__in=author_ids)
+        .values_list('pk', flat=True)
+    )
+    post_ids = list(
+        Post.objects.filter(author_id__in=author_ids)
+        .values_list('pk', flat=True)
+    )
+    BulkJob.objects.filter(pk=job.pk).update(
+        total=len(comment_ids) + len(post_ids)
+    )
+    yield from delete_comments(job, comment_ids)
+    yield from delete_posts(job, post_ids)
+
+
+HANDLERS = {
+    BulkJob.MOVE: move_posts,
+    BulkJob.DELETE: delete_posts,
+    BulkJob.PURGE: purge_authors,
+}
+
+
+def run_job(job_id, object_ids):
+    job = BulkJob.objects.get(pk=job_id)
+    BulkJob.objects.filter(pk=job_id).update(status=BulkJob.RUNNING)
+    processed = 0
+    try:
+        for count, post_ids in HANDLERS[job.action](job, object_ids):
+            processed += count
+            BulkJob.objects.filter(pk=job_id).update(processed=processed)
+            posts_changed.send(sender=Post, post_ids=post_ids)
+    except Exception as error:
+        logger.exception('Фоновая задача %s завершилась ошибкой', job_id)
+        BulkJob.objects.filter(pk=job_id).update(
+            status=BulkJob.FAILED, error=str(error), finished=timezone.now()
+        )
+        return
+    BulkJob.objects.filter(pk=job_id).update(
+        status=BulkJob.DONE, finished=timezone.now()
+    )
+
+
+def _run_in_thread(job_id, object_ids):
+    close_old_connections()
+    try:
+        run_job(job_id, object_ids)
+    finally:
+        connection.close()
+
+
+def start_job(action, object_ids, user=None, target_group=None):
+    """Создаёт задачу и запускает её после коммита текущей транзакции."""
+    object_ids = list(object_ids)
+    job = BulkJob.objects.create(
+        action=action,
+        total=len(object_ids),
+        created_by=user,
+        target_group=target_group,
+    )
+    if settings.BULK_JOBS_ASYNC:
+        transaction.on_commit(
+            lambda: _executor.submit(_run_in_thread, job.pk, object_ids)
+        )
+    else:
+        run_job(job.pk, object_ids)
+    return job
+
+
+def fail_stale_jobs(older_than=None):
+    """Помечает ошибкой задачи, которые остались в очереди процесса.
+
+    Очередь живёт в памяти: после перезапуска незавершённые задачи
+    навсегда остались бы «в очереди» или «выполняются». Список объектов
+    не хранится, поэтому задачу нельзя продолжить — её нужно запустить
+    заново. Уже обработанные пачки закоммичены и повторно безопасны.
+    """
+    stale = BulkJob.objects.filter(
+        status__in=(BulkJob.PENDING, BulkJob.RUNNING)
+    )
+    if older_than is not None:
+        stale = stale.filter(created__lt=timezone.now() - older_than)
+    return stale.update(
+        status=BulkJob.FAILED, error=STALE_JOB_ERROR, finished=timezone.now()
+    )
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+
+from core.objcache import get_object_cache
+
+
+def model_tag(model):
+    return model._meta.label_lower
+
+
+def object_tag(model, pk):
+    return f'{model_tag(model)}:{pk}'
+
+
+def cached_object_or_404(model, **lookup):
+    """get_object_or_404 через кэш объектов процесса.
+
+    Записи сбрасываются сигналами при сохранении и удалении объекта;
+    правки из других процессов видны не позже чем через
+    OBJECT_CACHE_TTL секунд. Только для чтения: view, которые меняют
+    объект или пишут что-то от его имени, берут его из БД.
+    """
+    if not settings.OBJECT_CACHE_ENABLED:
+        return get_object_or_404(model, **lookup)
+    cache = get_object_cache()
+    key = (model_tag(model), tuple(sorted(lookup.items())))
+    obj = cache.get(key)
+    if obj is None:
+        obj = get_object_or_404(model, **lookup)
+        cache.set(
+            key, obj, tags=(object_tag(model, obj.pk), model_tag(model))
+        )
+    return obj
+
+
+def invalidate_objects(model, pks):
+    get_object_cache().invalidate(*(object_tag(model, pk) for pk in pks))
+
+
+def invalidate_model(model):
+    get_object_cache().invalidate(model_tag(model))
@@ -0,0 +1,150 @@
+import cProfile
+import io
+import pstats
+import timeit
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template import Context, Template
+from django.utils import timezone
+
+from posts.cards import build_cards, build_feed_cards
+from posts.feed import rebuild_feed
+from posts.models import FeedItem, Group, Post
+
+User = get_user_model()
+
+# Прежний путь: {% include %} на каждый пост, {% url %} внутри карточки
+LEGACY_TEMPLATE = (
+    "{% for post in posts %}"
+    "{% include 'includes/post.html' "
+    "with show_group_link=True show_author_link=True %}"
+    "{% endfor %}"
+)
+CARDS_TEMPLATE = (
+    "{% load post_cards %}"
+    "{% for card in cards %}"
+    "{% post_card card show_group_link=True show_author_link=True "
+    "last=forloop.last %}"
+    "{% endfor %}"
+)
+
+# Функции, время которых считается временем построения ссылок
+REVERSE_FUNCTIONS = {'reverse', 'posts_reverse'}
+
+
+def make_posts(count):
+    """Несохранённые посты: бенчмарк меряет шаблоны, а не БД."""
+    group = Group(pk=1, title='Группа', slug='group')
+    author = User(pk=1, username='author', first_name='Лев',
+                  last_name='Толстой')
+    now = timezone.now()
+    return [
+        Post(pk=pk, text=f'Текст поста {pk} ' * 20, pub_date=now,
+             author=author, group=group)
+        for pk in range(1, count + 1)
+    ]
+
+
+def seed_posts(count):
+    """Сохранённые посты для замера запросов; вызывать в транзакции."""
+    group = Group.objects.create(
+        title='Бенчмарк', slug='benchmark-feed', description='-'
+    )
+    author = User.objects.create(
+        username='benchmark-feed', first_name='Лев', last_name='Толстой'
+    )
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(text=f'Текст поста {number} ' * 20, pub_date=now,
+             author=author, group=group)
+        for number in range(count)
+    )
+    rebuild_feed()
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает время отрисовки страницы ленты разными способами.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--posts', type=int, nargs='+', default=[10, 100],
+            help='Размеры страницы.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=50,
+            help='Сколько раз отрисовать каждую страницу.',
+        )
+        parser.add_argument(
+            '--db', type=int, metavar='POSTS',
+            help='Также сравнить запрос страницы с JOIN и из FeedItem на '
+                 'POSTS временных постах (транзакция откатывается).',
+        )
+        parser.add_argument(
+            '--profile', action='store_true',
+            help='Показать самые дорогие функции каждого способа.',
+        )
+
+    def benchmarks(self, posts):
+        legacy = Template(LEGACY_TEMPLATE)
+        cards = Template(CARDS_TEMPLATE)
+        return {
+            'include loop': lambda: legacy.render(Context({'posts': posts})),
+            'post_card': lambda: cards.render(
+                Context({'cards': build_cards(posts)})
+            ),
+        }
+
+    def db_benchmarks(self, count):
+        def joined():
+            posts = Post.objects.select_related('author', 'group')[:count]
+            return build_cards(posts)
+
+        def feed_items():
+            return build_feed_cards(FeedItem.objects.all()[:count])
+
+        return {'joined query': joined, 'feed items': feed_items}
+
+    def profile(self, name, bench, repeat):
+        profiler = cProfile.Profile()
+        profiler.runcall(lambda: [bench() for _ in range(repeat)])
+        buffer = io.StringIO()
+        stats = pstats.Stats(profiler, stream=buffer)
+        stats.sort_stats('cumulative').print_stats(15)
+        reverse_time = sum(
+            row[3] for (_, _, function), row in stats.stats.items()
+            if function in REVERSE_FUNCTIONS
+        )
+        self.stdout.write(f'--- {name}')
+        self.stdout.write(buffer.getvalue())
+        self.stdout.write(
+            f'reverse: {reverse_time / stats.total_tt:.1%} времени'
+        )
+
+    def measure(self, count, benchmarks, options):
+        results = {}
+        for name, bench in benchmarks.items():
+            bench()
+            results[name] = min(timeit.repeat(
+                bench, number=options['repeat'], repeat=3
+            )) / options['repeat']
+            if options['profile']:
+                self.profile(name, bench, options['repeat'])
+        baseline = next(iter(results.values()))
+        for name, seconds in results.items():
+            self.stdout.write(
+                f'{count:>5} постов  {name:<16} '
+                f'{seconds * 1000:8.3f} мс  x{baseline / seconds:.2f}'
+            )
+
+    def handle(self, *args, **options):
+        for count in options['posts']:
+            self.measure(count, self.benchmarks(make_posts(count)), options)
+        if not options['db']:
+            return
+        with transaction.atomic():
+            seed_posts(options['db'])
+            for count in options['posts']:
+                self.measure(count, self.db_benchmarks(count), options)
+            transaction.set_rollback(True)
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from posts.trending import SCORE_DECAY, decay_scores
+
+
+class Command(BaseCommand):
+    help = 'Уменьшает рейтинг популярных постов. Запускать по cron раз в час.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--factor',
+            type=float,
+            default=SCORE_DECAY,
+            help='Множитель затухания за один запуск.',
+        )
+
+    def handle(self, *args, **options):
+        updated = decay_scores(options['factor'])
+        self.stdout.write(f'Обновлён рейтинг {updated} постов')
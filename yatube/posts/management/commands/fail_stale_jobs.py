@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from posts.jobs import fail_stale_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        'Помечает ошибкой фоновые задачи, прерванные перезапуском. '
+        'Запускать при деплое до старта процессов приложения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=float,
+            default=None,
+            help=(
+                'Трогать только задачи старше N минут; без параметра — '
+                'все незавершённые.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        older_than = options['older_than']
+        failed = fail_stale_jobs(
+            None if older_than is None else timedelta(minutes=older_than)
+        )
+        self.stdout.write(f'Прерванных задач: {failed}')
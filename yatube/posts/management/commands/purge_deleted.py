@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from posts.tombstones import PURGE_BATCH_SIZE, purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        'Физически удаляет посты и комментарии, помеченные удалёнными. '
+        'Работает небольшими пачками; запускать по cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=float,
+            default=24,
+            help='Удалять только то, что помечено больше N часов назад.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=PURGE_BATCH_SIZE,
+            help='Сколько строк удалять в одной транзакции.',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.1,
+            help='Пауза между пачками в секундах.',
+        )
+
+    def handle(self, *args, **options):
+        comments, posts = purge_deleted(
+            older_than=timedelta(hours=options['older_than']),
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+        )
+        self.stdout.write(
+            f'Удалено комментариев: {comments}, постов: {posts}'
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts.archive import rebuild_archive
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает число постов по месяцам для архива. Нужен, только '
+        'если посты менялись в обход сигналов (raw SQL, loaddata).'
+    )
+
+    def handle(self, *args, **options):
+        buckets = rebuild_archive()
+        self.stdout.write(f'Пересчитано месяцев: {buckets}')
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from posts.feed import rebuild_feed
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет таблицу ленты (FeedItem) заново. Нужен после включения '
+        'FEED_READ_MODEL и после правок постов в обход сигналов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Сколько строк вставлять одним запросом.',
+        )
+
+    def handle(self, *args, **options):
+        created = rebuild_feed(options['batch_size'])
+        self.stdout.write(f'Строк ленты: {created}')
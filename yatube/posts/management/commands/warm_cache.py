@@ -0,0 +1,146 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from posts.directory import group_directory_page
+from posts.jobs import chunked
+from posts.models import Group, Post
+from posts.renditions import image_contexts
+from posts.trending import trending_posts
+from posts.views import POSTS_PER_PAGE
+
+User = get_user_model()
+
+# кэши в памяти процесса: прогретое в них не переживёт выход из команды
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def hottest(queryset, since, limit):
+    """Самые активные группы или авторы: свежие посты и их просмотры.
+
+    score поста уже складывает просмотры и комментарии, поэтому сумма
+    по постам за период и есть «горячесть» ленты.
+    """
+    recent = Q(posts__pub_date__gte=since)
+    return queryset.annotate(
+        recent_score=Sum('posts__score', filter=recent),
+        recent_posts=Count('posts', filter=recent),
+    ).filter(recent_posts__gt=0).order_by(
+        '-recent_score', '-recent_posts'
+    )[:limit]
+
+
+def feed_images(since, groups=10, profiles=10, pages=3):
+    """Картинки постов с первых pages страниц горячих лент.
+
+    Ленты — главная, популярное, самые активные группы и авторы; каждая
+    картинка попадает в список один раз.
+    """
+    latest = Post.objects.order_by('-pub_date', '-pk')
+    feeds = [
+        latest,
+        trending_posts(),
+        latest.filter(group__in=list(hottest(Group.objects, since, groups))),
+        latest.filter(
+            author__in=list(hottest(User.objects, since, profiles))
+        ),
+    ]
+    images = {}
+    for feed in feeds:
+        for post in feed.only('image')[:pages * POSTS_PER_PAGE]:
+            if post.image:
+                images.setdefault(post.image.name, post.image)
+    return list(images.values())
+
+
+def warm_renditions(images):
+    """Нарезки и контексты <picture> для пачки картинок."""
+    try:
+        return len(image_contexts(images))
+    finally:
+        # у каждого потока пула своё соединение с БД
+        connections.close_all()
+
+
+def shared_cache():
+    return not isinstance(caches['default'], PROCESS_LOCAL_CACHES)
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогревает то, что страницы ленты берут из общих хранилищ: '
+        'нарезки картинок с первых страниц главной, популярного, горячих '
+        'групп и профилей (файлы и хранилище sorl-thumbnail) и их '
+        'контексты <picture> в кэше, а также первые страницы каталога '
+        'групп. Сами страницы и фрагменты ленты на сервере не кэшируются '
+        'и не прогреваются. С кэшем в памяти процесса (locmem, dummy) '
+        'остаются только нарезки: контексты и каталог пропадут вместе '
+        'с командой, поэтому каталог не прогревается.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--groups', type=int, default=10,
+            help='Сколько самых активных групп прогреть.',
+        )
+        parser.add_argument(
+            '--profiles', type=int, default=10,
+            help='Сколько самых активных авторов прогреть.',
+        )
+        parser.add_argument(
+            '--pages', type=int, default=3,
+            help='Сколько первых страниц каждой ленты и каталога взять.',
+        )
+        parser.add_argument(
+            '--days', type=int, default=7,
+            help='За сколько дней учитывать активность.',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help='Сколько пачек картинок нарезать одновременно.',
+        )
+
+    def warm_images(self, options):
+        since = timezone.now() - timedelta(days=options['days'])
+        images = feed_images(
+            since, options['groups'], options['profiles'], options['pages']
+        )
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            return sum(pool.map(
+                warm_renditions, chunked(images, POSTS_PER_PAGE)
+            ))
+
+    def warm_directory(self, pages):
+        for page in range(1, pages + 1):
+            page_obj = group_directory_page(page)
+            if not page_obj.has_next():
+                return page
+        return pages
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        images = self.warm_images(options)
+        self.stdout.write(
+            f'Картинок нарезано: {images} за '
+            f'{time.perf_counter() - started:.1f} с'
+        )
+        if not shared_cache():
+            self.stdout.write(
+                f'CACHES["default"] — {type(caches["default"]).__name__}, '
+                'кэш в памяти процесса: контексты картинок пропадут вместе '
+                'с командой, каталог групп не прогревается. Настройте общий '
+                'кэш (memcached, redis, база или файлы).'
+            )
+            return
+        self.stdout.write(
+            f'Страниц каталога групп: {self.warm_directory(options["pages"])}'
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_bulkjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='score',
+            field=models.FloatField(db_index=True, default=0, editable=False, verbose_name='Рейтинг'),
+        ),
+    ]
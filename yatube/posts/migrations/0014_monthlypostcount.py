@@ -0,0 +1,54 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:15
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_monthly_counts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    MonthlyPostCount = apps.get_model('posts', 'MonthlyPostCount')
+    counts = Counter()
+    for group_id, author_id, pub_date in Post.objects.values_list(
+        'group_id', 'author_id', 'pub_date'
+    ).iterator():
+        if timezone.is_aware(pub_date):
+            pub_date = timezone.localtime(pub_date)
+        scopes = ['all', f'author:{author_id}']
+        if group_id is not None:
+            scopes.append(f'group:{group_id}')
+        counts.update(
+            (scope, pub_date.year, pub_date.month) for scope in scopes
+        )
+    MonthlyPostCount.objects.bulk_create(
+        MonthlyPostCount(scope=scope, year=year, month=month, count=count)
+        for (scope, year, month), count in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_group_directory_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyPostCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=64, verbose_name='Лента')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Год')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Месяц')),
+                ('count', models.IntegerField(default=0, verbose_name='Число постов')),
+            ],
+            options={
+                'verbose_name': 'Постов за месяц',
+                'verbose_name_plural': 'Постов за месяц',
+                'ordering': ('-year', '-month'),
+                'unique_together': {('scope', 'year', 'month')},
+            },
+        ),
+        migrations.RunPython(fill_monthly_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_monthlypostcount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='deleted',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Удалён'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='deleted',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Удалён'),
+        ),
+    ]
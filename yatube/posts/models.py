@@ -5,9 +5,21 @@ User = get_user_model()
 POST_STR_LENGTH: int = 15
 
 
+class AliveManager(models.Manager):
+    """Менеджер по умолчанию: строки, помеченные удалёнными, не видны.
+
+    Через него же работают related-менеджеры (group.posts,
+    post.comments), так что удалённое пропадает из лент и счётчиков.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted__isnull=True)
+
+
 class Group(models.Model):
     title = models.CharField(
         max_length=200,
+        db_index=True,
         verbose_name='Название'
     )
     slug = models.SlugField(unique=True)
@@ -50,9 +62,38 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True
     )
+    views = models.PositiveIntegerField(
+        verbose_name='Просмотры',
+        default=0,
+        editable=False,
+    )
+    score = models.FloatField(
+        verbose_name='Рейтинг',
+        default=0,
+        db_index=True,
+        editable=False,
+    )
+    # Надгробие: пост скрыт сразу, а физически удаляется позже
+    # командой purge_deleted вместе с комментариями
+    deleted = models.DateTimeField(
+        verbose_name='Удалён',
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+    )
+
+    objects = AliveManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ('-pub_date',)
+        # лента группы и сводка каталога групп
+        indexes = [
+            models.Index(
+                fields=['group', '-pub_date'], name='post_group_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Публикация'
         verbose_name_plural = 'Публикации'
 
@@ -81,9 +122,242 @@ class Comment(models.Model):
         verbose_name='Дата комментария',
         auto_now_add=True,
     )
+    deleted = models.DateTimeField(
+        verbose_name='Удалён',
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+    )
+
+    objects = AliveManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ('-created',)
 
     def __str__(self):
         return self.text[:POST_STR_LENGTH]
+
+
+class MonthlyPostCount(models.Model):
+    """Число постов за месяц в ленте: общей, группы или автора.
+
+    Поддерживается сигналами при сохранении и удалении постов, чтобы
+    архив не считал GROUP BY по всей таблице постов.
+    """
+
+    scope = models.CharField(
+        max_length=64,
+        verbose_name='Лента',
+    )
+    year = models.PositiveSmallIntegerField(verbose_name='Год')
+    month = models.PositiveSmallIntegerField(verbose_name='Месяц')
+    count = models.IntegerField(
+        default=0,
+        verbose_name='Число постов',
+    )
+
+    class Meta:
+        ordering = ('-year', '-month')
+        unique_together = ('scope', 'year', 'month')
+        verbose_name = 'Постов за месяц'
+        verbose_name_plural = 'Постов за месяц'
+
+    def __str__(self):
+        return f'{self.scope} {self.month:02}.{self.year}: {self.count}'
+
+
+class PostRevision(models.Model):
+    """Версия поста в истории правок.
+
+    В снимке text — полный текст, в остальных версиях — дельта
+    к предыдущей (см. posts.revisions). Группа и картинка хранятся
+    как есть: они короткие.
+    """
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name='Пост',
+        related_name='revisions',
+    )
+    number = models.PositiveIntegerField(verbose_name='Номер версии')
+    is_snapshot = models.BooleanField(
+        default=False,
+        verbose_name='Полная копия',
+    )
+    text = models.TextField(verbose_name='Текст или дельта')
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.SET_NULL,
+        verbose_name='Группа',
+        related_name='+',
+        blank=True,
+        null=True,
+    )
+    image = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name='Картинка',
+    )
+    editor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        verbose_name='Автор правки',
+        related_name='+',
+        blank=True,
+        null=True,
+    )
+    created = models.DateTimeField(
+        verbose_name='Дата правки',
+        auto_now_add=True,
+    )
+
+    class Meta:
+        ordering = ('-number',)
+        unique_together = ('post', 'number')
+        verbose_name = 'Версия поста'
+        verbose_name_plural = 'Версии постов'
+
+    def __str__(self):
+        return f'{self.post_id} v{self.number}'
+
+
+class FeedItem(models.Model):
+    """Строка ленты: всё, что нужно карточке поста, без JOIN.
+
+    Денормализованная копия Post + имя автора + slug группы. Включается
+    настройкой FEED_READ_MODEL, поддерживается сигналами (posts.feed),
+    пересобирается командой rebuild_feed.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feed_item',
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата публикации')
+    text = models.TextField(verbose_name='Текст поста')
+    image = models.ImageField(
+        verbose_name='Картинка',
+        upload_to='posts/',
+        blank=True,
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    author_username = models.CharField(max_length=150)
+    author_full_name = models.CharField(max_length=300, blank=True)
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        blank=True,
+        null=True,
+    )
+    group_slug = models.SlugField(blank=True)
+
+    class Meta:
+        ordering = ('-pub_date',)
+        indexes = [
+            models.Index(fields=['-pub_date'], name='feed_pub_date_idx'),
+            models.Index(
+                fields=['author', '-pub_date'], name='feed_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=['group', '-pub_date'], name='feed_group_pub_date_idx'
+            ),
+        ]
+        verbose_name = 'Строка ленты'
+        verbose_name_plural = 'Строки ленты'
+
+    def __str__(self):
+        return self.text[:POST_STR_LENGTH]
+
+
+class BulkJob(models.Model):
+    MOVE = 'move'
+    DELETE = 'delete'
+    PURGE = 'purge'
+    ACTION_CHOICES = (
+        (MOVE, 'Перенос в группу'),
+        (DELETE, 'Удаление постов'),
+        (PURGE, 'Удаление контента авторов'),
+    )
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Готово'),
+        (FAILED, 'Ошибка'),
+    )
+
+    action = models.CharField(
+        max_length=16,
+        choices=ACTION_CHOICES,
+        verbose_name='Действие',
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Статус',
+    )
+    target_group = models.ForeignKey(
+        Group,
+        on_delete=models.SET_NULL,
+        verbose_name='Группа назначения',
+        related_name='+',
+        blank=True,
+        null=True,
+    )
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        verbose_name='Запустил',
+        related_name='+',
+        blank=True,
+        null=True,
+    )
+    total = models.PositiveIntegerField(
+        verbose_name='Всего объектов',
+        default=0,
+    )
+    processed = models.PositiveIntegerField(
+        verbose_name='Обработано',
+        default=0,
+    )
+    error = models.TextField(
+        verbose_name='Ошибка',
+        blank=True,
+    )
+    created = models.DateTimeField(
+        verbose_name='Создано',
+        auto_now_add=True,
+    )
+    finished = models.DateTimeField(
+        verbose_name='Завершено',
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        ordering = ('-created',)
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+
+    def __str__(self):
+        return f'{self.get_action_display()} #{self.pk}'
+
+    @property
+    def progress(self):
+        if not self.total:
+            return 100
+        return self.processed * 100 // self.total
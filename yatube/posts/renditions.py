@@ -0,0 +1,132 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection, transaction
+from PIL import features
+from sorl.thumbnail import get_thumbnail
+from sorl.thumbnail.base import EXTENSIONS
+from sorl.thumbnail.images import DummyImageFile
+
+# Ширины нарезок и пропорции исходного кадра 960x339
+RENDITION_WIDTHS = (320, 640, 960)
+RENDITION_RATIO: float = 339 / 960
+RENDITION_SIZES = '(max-width: 576px) 100vw, (max-width: 992px) 75vw, 960px'
+FALLBACK_FORMAT = 'JPEG'
+# Порядок важен: браузер берёт первый подходящий <source>
+MODERN_FORMATS = ('AVIF', 'WEBP')
+RENDITIONS_CACHE_PREFIX = 'posts:renditions:'
+RENDITIONS_CACHE_TIMEOUT: int = 60 * 60 * 24
+
+# Один фоновый поток: нарезка не держит запрос с загрузкой картинки и не
+# конкурирует за единственного писателя SQLite (хранилище sorl в БД).
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='renditions')
+
+
+@lru_cache(maxsize=None)
+def modern_formats():
+    """Современные форматы, которые умеют и Pillow, и sorl-thumbnail."""
+    supported = features.get_supported_modules()
+    return tuple(
+        image_format for image_format in MODERN_FORMATS
+        if image_format.lower() in supported and image_format in EXTENSIONS
+    )
+
+
+def rendition_geometry(width):
+    return f'{width}x{round(width * RENDITION_RATIO)}'
+
+
+def get_renditions(image, image_format=FALLBACK_FORMAT):
+    """Список пар (ширина, миниатюра) для одного формата."""
+    if settings.THUMBNAIL_DUMMY:
+        return [
+            (width, DummyImageFile(rendition_geometry(width)))
+            for width in RENDITION_WIDTHS
+        ]
+    return [
+        (width, get_thumbnail(
+            image,
+            rendition_geometry(width),
+            crop='center',
+            upscale=True,
+            format=image_format,
+        ))
+        for width in RENDITION_WIDTHS
+    ]
+
+
+def build_srcset(renditions):
+    return ', '.join(f'{thumb.url} {width}w' for width, thumb in renditions)
+
+
+def generate_renditions(image):
+    """Заранее нарезает картинку во всех ширинах и форматах."""
+    if not image:
+        return
+    for image_format in (FALLBACK_FORMAT,) + modern_formats():
+        get_renditions(image, image_format)
+
+
+def _generate_in_thread(image):
+    close_old_connections()
+    try:
+        generate_renditions(image)
+    finally:
+        connection.close()
+
+
+def schedule_renditions(image):
+    """Нарезает картинку в фоне после коммита текущей транзакции.
+
+    Страница, открытая раньше, чем нарезка закончится, дорежет
+    недостающие миниатюры сама, как и без предварительной нарезки.
+    """
+    transaction.on_commit(lambda: _executor.submit(_generate_in_thread, image))
+
+
+def build_image_context(image):
+    """Всё, что нужно шаблону <picture>, в виде простых строк."""
+    renditions = get_renditions(image, FALLBACK_FORMAT)
+    fallback = renditions[-1][1]
+    return {
+        'sources': [
+            {
+                'type': f'image/{image_format.lower()}',
+                'srcset': build_srcset(get_renditions(image, image_format)),
+            }
+            for image_format in modern_formats()
+        ],
+        'fallback': {
+            'url': fallback.url,
+            'width': fallback.width,
+            'height': fallback.height,
+        },
+        'srcset': build_srcset(renditions),
+        'sizes': RENDITION_SIZES,
+    }
+
+
+def image_contexts(images):
+    """Контексты картинок целой страницы: один cache.get_many на всех."""
+    images = {image.name: image for image in images if image}
+    keys = {RENDITIONS_CACHE_PREFIX + name: name for name in images}
+    cached = cache.get_many(keys)
+    contexts = {keys[key]: value for key, value in cached.items()}
+    missing = {
+        key: build_image_context(images[name])
+        for key, name in keys.items() if key not in cached
+    }
+    if missing:
+        cache.set_many(missing, RENDITIONS_CACHE_TIMEOUT)
+        contexts.update(
+            (keys[key], value) for key, value in missing.items()
+        )
+    return contexts
+
+
+def image_context(image):
+    if not image:
+        return None
+    return image_contexts([image])[image.name]
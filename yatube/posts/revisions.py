@@ -0,0 +1,127 @@
+import json
+import re
+from difflib import SequenceMatcher
+
+from django.db import transaction
+from django.db.models import Max
+
+from .models import PostRevision
+
+# Каждая N-я версия хранится целиком: чтение любой версии применяет
+# не больше N - 1 дельт
+SNAPSHOT_INTERVAL: int = 10
+TOKEN_RE = re.compile(r'\s+|\S+\s*')
+
+
+def tokenize(text):
+    """Слова вместе с пробелами после них; склеиваются обратно в text."""
+    return TOKEN_RE.findall(text)
+
+
+def make_delta(old, new):
+    """Пословная дельта текста в компактном JSON.
+
+    [начало, конец] — диапазон слов старой версии, строка — новый
+    текст. Размер дельты растёт с объёмом правки, а не всего текста,
+    даже если пост — одна длинная строка.
+    """
+    old_tokens = tokenize(old)
+    new_tokens = tokenize(new)
+    delta = []
+    matcher = SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            delta.append([i1, i2])
+        elif j1 < j2:
+            delta.append(''.join(new_tokens[j1:j2]))
+    return json.dumps(delta, ensure_ascii=False, separators=(',', ':'))
+
+
+def apply_delta(old, delta):
+    old_tokens = tokenize(old)
+    return ''.join(
+        ''.join(old_tokens[part[0]:part[1]]) if isinstance(part, list)
+        else part
+        for part in json.loads(delta)
+    )
+
+
+def post_state(post):
+    """То, что попадает в историю: текст, группа и картинка."""
+    return post.text, post.group_id, post.image.name or ''
+
+
+def record_revision(post, old_state, editor=None):
+    """Сохраняет правку поста; old_state — post_state() до правки.
+
+    Первая правка сначала записывает исходную версию целиком. Дельта
+    строится от текста последней сохранённой версии, так что цепочка
+    остаётся согласованной, даже если пост меняли в обход истории.
+    Если дельта не короче текста, версия хранится снимком.
+    """
+    text, group_id, image = post_state(post)
+    if (text, group_id, image) == old_state:
+        return None
+    with transaction.atomic():
+        last = post.revisions.select_for_update().order_by(
+            '-number'
+        ).first()
+        if last is None:
+            old_text, old_group_id, old_image = old_state
+            last = PostRevision.objects.create(
+                post=post,
+                number=1,
+                is_snapshot=True,
+                text=old_text,
+                group_id=old_group_id,
+                image=old_image,
+                editor=post.author,
+            )
+        number = last.number + 1
+        is_snapshot = number % SNAPSHOT_INTERVAL == 1
+        if not is_snapshot:
+            delta = make_delta(revision_text(post, last.number), text)
+            # текст переписан почти целиком: снимок не длиннее дельты
+            # и к тому же читается без цепочки
+            is_snapshot = len(delta) >= len(text)
+            if not is_snapshot:
+                text = delta
+        return PostRevision.objects.create(
+            post=post,
+            number=number,
+            is_snapshot=is_snapshot,
+            text=text,
+            group_id=group_id,
+            image=image,
+            editor=editor,
+        )
+
+
+def revision_texts(revisions):
+    """Восстанавливает тексты подряд идущих версий, начиная со снимка."""
+    texts = {}
+    text = ''
+    for revision in revisions:
+        if revision.is_snapshot:
+            text = revision.text
+        else:
+            text = apply_delta(text, revision.text)
+        texts[revision.number] = text
+    return texts
+
+
+def revision_text(post, number):
+    """Текст версии number.
+
+    Читается ближайший снимок и не больше SNAPSHOT_INTERVAL - 1 дельт
+    после него.
+    """
+    snapshot = post.revisions.filter(
+        number__lte=number, is_snapshot=True
+    ).aggregate(number=Max('number'))['number']
+    if snapshot is None:
+        return None
+    revisions = post.revisions.filter(
+        number__gte=snapshot, number__lte=number
+    ).order_by('number')
+    return revision_texts(revisions).get(number)
@@ -0,0 +1,94 @@
+import re
+import threading
+from urllib.parse import quote
+
+from django.urls import NoReverseMatch, get_resolver, get_urlconf, reverse
+from django.urls.converters import IntConverter
+from django.urls.resolvers import RoutePattern
+from django.utils.http import RFC3986_SUBDELIMS
+
+NAMESPACE = 'posts'
+SAFE_CHARS = RFC3986_SUBDELIMS + '/~:@'
+# Значения из таких символов quote() не меняет: его можно не вызывать
+is_url_safe = re.compile(r'[-\w.~]*\Z', re.ASCII).match
+# Метки, которые проходят любой стандартный конвертер, кроме uuid
+SENTINEL_NUMBER = 987654321
+SENTINEL_TEXT = 'zqxroute'
+
+
+class RouteTemplates:
+    """Маршруты posts, заранее превращённые в строки для str.format.
+
+    Шаблоны собираются одним настоящим reverse() на маршрут и
+    пересобираются, когда Django создаёт новый резолвер
+    (clear_url_caches, смена ROOT_URLCONF).
+    """
+
+    def __init__(self, namespace=NAMESPACE):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._resolver = None
+        self._templates = {}
+
+    def _compile_route(self, name, pattern):
+        sentinels = {}
+        for index, (param, converter) in enumerate(
+            pattern.converters.items()
+        ):
+            if isinstance(converter, IntConverter):
+                sentinels[param] = SENTINEL_NUMBER + index
+            else:
+                sentinels[param] = f'{SENTINEL_TEXT}{index}'
+        url = reverse(f'{self.namespace}:{name}', kwargs=sentinels)
+        url = url.replace('{', '{{').replace('}', '}}')
+        for param, sentinel in sentinels.items():
+            url = url.replace(str(sentinel), '{%s}' % param, 1)
+        return url, tuple(pattern.converters)
+
+    def _compile(self, resolver):
+        _, namespace_resolver = resolver.namespace_dict[self.namespace]
+        templates = {}
+        for pattern in namespace_resolver.url_patterns:
+            if pattern.name and isinstance(pattern.pattern, RoutePattern):
+                templates[pattern.name] = self._compile_route(
+                    pattern.name, pattern.pattern
+                )
+        return templates
+
+    def get(self, name):
+        resolver = get_resolver(get_urlconf())
+        if resolver is not self._resolver:
+            with self._lock:
+                if resolver is not self._resolver:
+                    self._templates = self._compile(resolver)
+                    self._resolver = resolver
+        return self._templates.get(name)
+
+    def reverse(self, name, *args, **kwargs):
+        compiled = self.get(name)
+        if compiled is None:
+            return reverse(
+                f'{self.namespace}:{name}', args=args, kwargs=kwargs
+            )
+        template, params = compiled
+        if args:
+            if kwargs or len(args) != len(params):
+                raise NoReverseMatch(
+                    f'Неверные аргументы для {self.namespace}:{name}'
+                )
+            kwargs = dict(zip(params, args))
+        values = {}
+        for param in params:
+            value = str(kwargs[param])
+            values[param] = (
+                value if is_url_safe(value) else quote(value, safe=SAFE_CHARS)
+            )
+        return template.format(**values)
+
+
+route_templates = RouteTemplates()
+
+
+def posts_reverse(name, *args, **kwargs):
+    """Быстрый аналог reverse('posts:<name>', ...) для горячих шаблонов."""
+    return route_templates.reverse(name, *args, **kwargs)
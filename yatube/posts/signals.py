@@ -0,0 +1,136 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save,
+)
+from django.dispatch import Signal, receiver
+
+from . import archive, feed
+from .caches import invalidate_group_choices
+from .directory import invalidate_group_directory
+from .lookups import invalidate_model, invalidate_objects
+from .models import Comment, Group, Post
+from .trending import COMMENT_WEIGHT, add_scores
+
+# Отправляется один раз на пачку изменённых постов, а не на каждый пост:
+# подписчики сбрасывают свои кэши сразу для всей пачки.
+posts_changed = Signal(providing_args=['post_ids'])
+
+
+@receiver(post_save, sender=Post)
+def post_image_renditions(sender, instance, **kwargs):
+    # правка текста картинку не трогает: нарезки уже есть
+    image = instance.image
+    if not image or image.name == getattr(instance, '_old_image', None):
+        return
+    # Pillow и sorl-thumbnail тяжёлые: импортируем при первой картинке,
+    # а не при старте каждого воркера и management-команды
+    from .renditions import schedule_renditions
+    schedule_renditions(image)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_choices_changed(sender, **kwargs):
+    invalidate_group_choices()
+
+
+@receiver(post_save, sender=Comment)
+def comment_score(sender, instance, created, **kwargs):
+    if created:
+        add_scores({instance.post_id: COMMENT_WEIGHT})
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(posts_changed)
+def group_directory_changed(sender, **kwargs):
+    invalidate_group_directory()
+
+
+def archive_values(post):
+    return post.group_id, post.author_id, post.pub_date
+
+
+@receiver(pre_save, sender=Post)
+def remember_old_values(sender, instance, **kwargs):
+    # при правке группа и картинка могли смениться: запоминаем, где пост
+    # был в архиве и какая картинка уже нарезана
+    instance._archive_values = instance._old_image = None
+    if instance._state.adding:
+        return
+    old = Post.objects.filter(pk=instance.pk).values_list(
+        'group_id', 'author_id', 'pub_date', 'image'
+    ).first()
+    if old is not None:
+        instance._archive_values, instance._old_image = old[:3], old[3]
+
+
+@receiver(post_save, sender=Post)
+def archive_post_saved(sender, instance, created, **kwargs):
+    old = getattr(instance, '_archive_values', None)
+    new = archive_values(instance)
+    if created or old != new:
+        archive.update_buckets(old, new)
+
+
+@receiver(post_delete, sender=Post)
+def archive_post_deleted(sender, instance, **kwargs):
+    # надгробие уже убрало пост из архива
+    if instance.deleted is None:
+        archive.update_buckets(archive_values(instance), None)
+
+
+# Таблица ленты ведётся только при FEED_READ_MODEL; после включения
+# настройки её нужно заполнить командой rebuild_feed
+@receiver(post_save, sender=Post)
+def feed_post_saved(sender, instance, **kwargs):
+    if settings.FEED_READ_MODEL:
+        feed.sync_feed_items([instance.pk])
+
+
+@receiver(posts_changed)
+def feed_posts_changed(sender, post_ids, **kwargs):
+    if settings.FEED_READ_MODEL:
+        feed.sync_feed_items(post_ids)
+
+
+@receiver(post_save, sender=get_user_model())
+def feed_author_saved(sender, instance, created, **kwargs):
+    if settings.FEED_READ_MODEL and not created:
+        feed.rename_author(instance)
+
+
+@receiver(post_save, sender=Group)
+def feed_group_saved(sender, instance, created, **kwargs):
+    if settings.FEED_READ_MODEL and not created:
+        feed.rename_group(instance)
+
+
+@receiver(pre_delete, sender=Group)
+def feed_group_deleted(sender, instance, **kwargs):
+    if settings.FEED_READ_MODEL:
+        feed.detach_group(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def object_cache_changed(sender, instance, **kwargs):
+    invalidate_objects(sender, [instance.pk])
+
+
+@receiver(posts_changed)
+def object_cache_posts_changed(sender, post_ids, **kwargs):
+    invalidate_objects(Post, post_ids)
+
+
+@receiver(post_delete, sender=Group)
+def object_cache_group_deleted(sender, **kwargs):
+    # посты группы отвязываются через UPDATE без сигналов
+    invalidate_model(Post)
@@ -0,0 +1,17 @@
+from django import template
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/post_card.html')
+def post_card(card, show_author_link=False, show_group_link=False,
+              last=False):
+    """Карточка поста из контекста, подготовленного build_cards."""
+    return {
+        'card': card,
+        'image': card['image'],
+        'css_class': 'card-img my-2',
+        'show_author_link': show_author_link,
+        'show_group_link': show_group_link,
+        'last': last,
+    }
@@ -0,0 +1,11 @@
+from django import template
+
+from ..renditions import image_context
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(image, css_class='card-img my-2'):
+    """<picture> с srcset/sizes вместо одной нарезки 960x339."""
+    return {'image': image_context(image), 'css_class': css_class}
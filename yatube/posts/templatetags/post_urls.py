@@ -0,0 +1,11 @@
+from django import template
+
+from ..routes import posts_reverse
+
+register = template.Library()
+
+
+@register.simple_tag
+def posts_url(name, *args, **kwargs):
+    """{% posts_url 'profile' username %} вместо {% url 'posts:profile' %}."""
+    return posts_reverse(name, *args, **kwargs)
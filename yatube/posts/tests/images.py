@@ -0,0 +1,42 @@
+import io
+from functools import lru_cache
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import empty
+from PIL import Image
+
+CONTENT_TYPES = {'GIF': 'image/gif', 'PNG': 'image/png'}
+IN_MEMORY_STORAGE = 'core.storage.InMemoryStorage'
+
+
+@receiver(setting_changed)
+def thumbnail_storage_changed(setting, **kwargs):
+    """sorl-thumbnail читает хранилище миниатюр один раз на процесс.
+
+    Без сброса override_settings(THUMBNAIL_STORAGE=...) не действует, и
+    миниатюры из тестов попадают в настоящий MEDIA_ROOT.
+    """
+    if setting in ('DEFAULT_FILE_STORAGE', 'THUMBNAIL_STORAGE'):
+        from sorl.thumbnail import default
+        from sorl.thumbnail.conf import settings as thumbnail_settings
+        thumbnail_settings._wrapped = empty
+        default.storage._wrapped = empty
+
+
+@lru_cache(maxsize=None)
+def image_bytes(image_format='GIF', size=(2, 1)):
+    """Картинка собирается один раз на процесс, дальше берётся из кэша."""
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, image_format)
+    return buffer.getvalue()
+
+
+def uploaded_image(name='small.gif', image_format='GIF', size=(2, 1)):
+    """Свежий файл для формы: прочитанный загрузчик повторно не отдать."""
+    return SimpleUploadedFile(
+        name=name,
+        content=image_bytes(image_format, size),
+        content_type=CONTENT_TYPES[image_format],
+    )
@@ -0,0 +1,107 @@
+from http import HTTPStatus
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.paginator import ESTIMATE_THRESHOLD, EstimatedCountPaginator
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class PostAdminTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin'
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+        self.url = reverse('admin:posts_post_changelist')
+
+    def create_posts(self, count):
+        Post.objects.bulk_create(
+            Post(text='Текст ' * 100, author=self.admin, group=self.group)
+            for _ in range(count)
+        )
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.admin_client.get(self.url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Число запросов changelist не зависит от числа строк."""
+        self.create_posts(2)
+        # Первый запрос прогревает кэш списка групп
+        self.admin_client.get(self.url)
+        few = self.count_queries()
+        self.create_posts(20)
+        self.assertEqual(self.count_queries(), few)
+
+    def test_changelist_truncates_text(self):
+        """В changelist выводится только начало текста поста."""
+        self.create_posts(1)
+        response = self.admin_client.get(self.url)
+        self.assertNotContains(response, 'Текст ' * 100)
+        self.assertContains(response, 'admin-autocomplete')
+
+    def test_group_missing_from_cache_is_rendered(self):
+        """Группа, которой нет в кэше подписей, всё равно выводится.
+
+        Иначе в строке не будет выбранного option, и сохранение
+        changelist обнулит группу поста.
+        """
+        self.create_posts(1)
+        self.admin_client.get(self.url)
+        # bulk_create не шлёт сигналов, кэш подписей остаётся старым
+        Group.objects.bulk_create([Group(
+            title='Новая группа', slug='new-slug', description='Описание'
+        )])
+        Post.objects.update(group=Group.objects.get(slug='new-slug'))
+        response = self.admin_client.get(self.url)
+        self.assertContains(response, 'selected>Новая группа</option>')
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        Post.objects.bulk_create(
+            Post(text='Текст', author=cls.user) for _ in range(3)
+        )
+
+    def test_small_table_counts_exactly(self):
+        """На маленькой таблице используется точный COUNT(*)."""
+        paginator = EstimatedCountPaginator(Post.objects.all(), 10)
+        self.assertEqual(paginator.count, 3)
+
+    def test_large_table_uses_estimate(self):
+        """На большой таблице без фильтров COUNT(*) не выполняется."""
+        estimate = ESTIMATE_THRESHOLD * 10
+        with mock.patch(
+            'core.paginator.estimate_count', return_value=estimate
+        ):
+            paginator = EstimatedCountPaginator(Post.objects.all(), 10)
+            self.assertEqual(paginator.count, estimate)
+            filtered = EstimatedCountPaginator(
+                Post.objects.filter(text='Текст'), 10
+            )
+            self.assertEqual(filtered.count, 3)
@@ -0,0 +1,121 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..archive import ALL_SCOPE, author_scope, group_scope
+from ..jobs import start_job
+from ..models import BulkJob, Group, MonthlyPostCount, Post
+
+User = get_user_model()
+
+
+def set_pub_date(post, year, month):
+    pub_date = timezone.make_aware(datetime.datetime(year, month, 15))
+    Post.objects.filter(pk=post.pk).update(pub_date=pub_date)
+    post.pub_date = pub_date
+
+
+@override_settings(STREAMING_RESPONSES=False)
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая', slug='other', description='Описание'
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def counts(self, scope):
+        return {
+            (bucket.year, bucket.month): bucket.count
+            for bucket in MonthlyPostCount.objects.filter(
+                scope=scope, count__gt=0
+            )
+        }
+
+    def test_counts_follow_create_edit_delete(self):
+        """Счётчики месяцев меняются при создании, правке и удалении."""
+        post = Post.objects.create(
+            text='Текст', author=self.user, group=self.group
+        )
+        month = timezone.localtime(post.pub_date)
+        key = (month.year, month.month)
+        for scope in (
+            ALL_SCOPE, author_scope(self.user.pk), group_scope(self.group.pk)
+        ):
+            with self.subTest(scope=scope):
+                self.assertEqual(self.counts(scope), {key: 1})
+        post.group = self.other_group
+        post.save()
+        self.assertEqual(self.counts(group_scope(self.group.pk)), {})
+        self.assertEqual(
+            self.counts(group_scope(self.other_group.pk)), {key: 1}
+        )
+        post.delete()
+        self.assertEqual(self.counts(ALL_SCOPE), {})
+
+    def test_sidebar_without_group_by(self):
+        """Панель архива читает готовые счётчики, без GROUP BY."""
+        Post.objects.create(text='Текст', author=self.user)
+        with self.assertNumQueries(3):
+            response = self.guest_client.get(reverse('posts:index'))
+        self.assertEqual(len(response.context['archive']), 1)
+
+    def test_month_pages(self):
+        """Архивные страницы ленты, группы и автора показывают свой месяц."""
+        old = Post.objects.create(
+            text='Старый', author=self.user, group=self.group
+        )
+        set_pub_date(old, 2020, 5)
+        Post.objects.create(text='Новый', author=self.user, group=self.group)
+        urls = (
+            reverse('posts:index_archive', args=(2020, 5)),
+            reverse('posts:group_archive', args=('group', 2020, 5)),
+            reverse('posts:profile_archive', args=('author', 2020, 5)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                cards = response.context['page_obj'].cards
+                self.assertEqual([card['post'] for card in cards], [old])
+                self.assertEqual(
+                    response.context['archive_month'],
+                    datetime.date(2020, 5, 1),
+                )
+
+    def test_invalid_month(self):
+        """Несуществующий месяц — 404."""
+        response = self.guest_client.get(
+            reverse('posts:index_archive', args=(2020, 13))
+        )
+        self.assertTemplateUsed(response, 'core/404.html')
+
+    @override_settings(BULK_JOBS_ASYNC=False)
+    def test_bulk_move_updates_group_counts(self):
+        """Массовый перенос в другую группу переносит и счётчики."""
+        post = Post.objects.create(
+            text='Текст', author=self.user, group=self.group
+        )
+        start_job(BulkJob.MOVE, [post.pk], target_group=self.other_group)
+        self.assertEqual(self.counts(group_scope(self.group.pk)), {})
+        self.assertEqual(
+            sum(self.counts(group_scope(self.other_group.pk)).values()), 1
+        )
+
+    def test_rebuild_command(self):
+        """rebuild_archive восстанавливает счётчики с нуля."""
+        post = Post.objects.create(text='Текст', author=self.user)
+        set_pub_date(post, 2021, 2)
+        call_command('rebuild_archive', stdout=StringIO())
+        self.assertEqual(self.counts(ALL_SCOPE), {(2021, 2): 1})
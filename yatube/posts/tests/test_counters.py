@@ -0,0 +1,112 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..counters import ViewCounter, view_counter, write_views
+from ..models import Post
+from ..trending import VIEW_WEIGHT
+
+User = get_user_model()
+THREADS: int = 8
+HITS_PER_THREAD: int = 1000
+
+
+class ViewCounterTests(TestCase):
+    def test_concurrent_flushes_lose_nothing(self):
+        """Параллельные хиты и сбросы не теряют и не удваивают просмотры."""
+        flushed = []
+        lock = threading.Lock()
+
+        def writer(counts):
+            with lock:
+                flushed.append(counts)
+
+        counter = ViewCounter(
+            writer=writer, flush_size=37, hot_threshold=10 ** 9
+        )
+
+        def worker(number):
+            for hit in range(HITS_PER_THREAD):
+                counter.hit(hit % 5 + number)
+
+        threads = [
+            threading.Thread(target=worker, args=(number,))
+            for number in range(THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.flush()
+        total = sum(sum(counts.values()) for counts in flushed)
+        self.assertEqual(total, THREADS * HITS_PER_THREAD)
+        self.assertGreater(len(flushed), 1)
+
+    def test_hot_post_sampling(self):
+        """После порога просмотры учитываются выборочно с весом."""
+        rolls = iter([0.05, 0.5, 0.05])
+        counter = ViewCounter(
+            writer=lambda counts: None,
+            hot_threshold=2,
+            sample_rate=0.1,
+            rng=lambda: next(rolls),
+        )
+        for _ in range(5):
+            counter.hit(1)
+        self.assertEqual(counter.pending(1), 2 + 10 + 10)
+
+    def test_failed_flush_keeps_counts(self):
+        """При ошибке записи просмотры возвращаются в буфер."""
+        def writer(counts):
+            raise RuntimeError
+
+        counter = ViewCounter(writer=writer)
+        counter.hit(1)
+        with self.assertRaises(RuntimeError):
+            counter.flush()
+        self.assertEqual(counter.pending(1), 1)
+
+    def test_hit_survives_writer_error(self):
+        """Ошибка записи при сбросе из hit() не доходит до запроса."""
+        def writer(counts):
+            raise RuntimeError('database is locked')
+
+        counter = ViewCounter(writer=writer, flush_size=1)
+        with self.assertLogs('posts.counters', 'ERROR'):
+            counter.hit(1)
+            counter.hit(1)
+        self.assertEqual(counter.pending(1), 2)
+
+
+class PostViewsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(text='Пост', author=cls.user)
+        cls.other = Post.objects.create(text='Другой пост', author=cls.user)
+
+    def setUp(self):
+        view_counter.flush()
+
+    def test_write_views_single_update(self):
+        """Сброс буфера — один UPDATE для всех постов."""
+        with self.assertNumQueries(1):
+            write_views({self.post.pk: 3, self.other.pk: 5})
+        self.post.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual(self.post.views, 3)
+        self.assertEqual(self.other.views, 5)
+        self.assertAlmostEqual(self.other.score, 5 * VIEW_WEIGHT)
+
+    def test_post_detail_counts_views(self):
+        """Просмотр страницы поста попадает в счётчик."""
+        url = reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        Client().get(url)
+        Client().get(url)
+        self.assertEqual(view_counter.pending(self.post.pk), 2)
+        view_counter.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 2)
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..directory import group_directory, group_directory_page
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class GroupDirectoryTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.latest_author = User.objects.create_user(username='latest')
+        cls.busy_group = Group.objects.create(
+            title='Активная', slug='busy', description='Описание'
+        )
+        cls.empty_group = Group.objects.create(
+            title='Пустая', slug='empty', description='Описание'
+        )
+        Post.objects.create(
+            text='Старый', author=cls.author, group=cls.busy_group
+        )
+        cls.latest_post = Post.objects.create(
+            text='Новый', author=cls.latest_author, group=cls.busy_group
+        )
+        Post.objects.filter(pk=cls.latest_post.pk).update(
+            pub_date=timezone.now() + timedelta(hours=1)
+        )
+        cls.latest_post.refresh_from_db()
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_aggregates(self):
+        """Число постов, дата и автор последнего поста у каждой группы."""
+        with self.assertNumQueries(1):
+            groups = {group['slug']: group for group in group_directory()}
+        self.assertEqual(groups['busy']['posts_count'], 2)
+        self.assertEqual(
+            groups['busy']['last_pub_date'], self.latest_post.pub_date
+        )
+        self.assertEqual(groups['busy']['last_author'], 'latest')
+        self.assertEqual(groups['empty']['posts_count'], 0)
+        self.assertIsNone(groups['empty']['last_pub_date'])
+
+    def test_page_is_cached(self):
+        """Повторная страница каталога не ходит в базу."""
+        with self.assertNumQueries(2):
+            group_directory_page(1)
+        with self.assertNumQueries(0):
+            page_obj = group_directory_page(1)
+        self.assertEqual(
+            [group['slug'] for group in page_obj], ['busy', 'empty']
+        )
+
+    def test_new_post_invalidates_cache(self):
+        """Новый пост сразу виден в каталоге."""
+        group_directory_page(1)
+        Post.objects.create(
+            text='Ещё', author=self.author, group=self.empty_group
+        )
+        groups = {group['slug']: group for group in group_directory_page(1)}
+        self.assertEqual(groups['empty']['posts_count'], 1)
+        self.assertEqual(groups['empty']['last_author'], 'author')
+
+    def test_pagination(self):
+        """Каталог делится на страницы."""
+        page_obj = group_directory_page(2, per_page=1)
+        self.assertEqual(page_obj.paginator.num_pages, 2)
+        self.assertEqual([group['slug'] for group in page_obj], ['empty'])
+
+    def test_page_renders(self):
+        """/groups/ выводит группы со ссылками на ленту и автора."""
+        response = self.guest_client.get(reverse('posts:group_index'))
+        self.assertTemplateUsed(response, 'posts/group_index.html')
+        content = response.content.decode()
+        self.assertIn(
+            reverse('posts:group_list', kwargs={'slug': 'busy'}), content
+        )
+        self.assertIn(
+            reverse('posts:profile', kwargs={'username': 'latest'}), content
+        )
@@ -3,17 +3,25 @@ import tempfile
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
+from core.storage import InMemoryStorage
+
 from ..models import Comment, Group, Post
+from .images import IN_MEMORY_STORAGE, uploaded_image
 
 User = get_user_model()
 TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
 
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+@override_settings(
+    MEDIA_ROOT=TEMP_MEDIA_ROOT,
+    DEFAULT_FILE_STORAGE=IN_MEMORY_STORAGE,
+    THUMBNAIL_STORAGE=IN_MEMORY_STORAGE,
+    THUMBNAIL_DUMMY=True,
+    STREAMING_RESPONSES=False,
+)
 class PostFormTests(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -40,6 +48,7 @@ class PostFormTests(TestCase):
     @classmethod
     def tearDownClass(cls):
         super().tearDownClass()
+        InMemoryStorage.clear()
         shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
 
     def setUp(self):
@@ -52,19 +61,7 @@ class PostFormTests(TestCase):
     def test_create_post(self):
         """Валидная форма создает запись в Post."""
         posts_count = Post.objects.count()
-        small_gif = (
-            b'\x47\x49\x46\x38\x39\x61\x02\x00'
-            b'\x01\x00\x80\x00\x00\x00\x00\x00'
-            b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
-            b'\x00\x00\x00\x2C\x00\x00\x00\x00'
-            b'\x02\x00\x01\x00\x00\x02\x02\x0C'
-            b'\x0A\x00\x3B'
-        )
-        uploaded = SimpleUploadedFile(
-            name='small.gif',
-            content=small_gif,
-            content_type='image/gif'
-        )
+        uploaded = uploaded_image('small.gif')
         form_data = {
             'text': 'Тестовый текст',
             'group': self.group.pk,
@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.paginator import decode_cursor, encode_cursor
+
+from ..feed import rebuild_feed
+from ..models import Group, Post
+from ..views import POSTS_PER_PAGE
+
+User = get_user_model()
+POSTS_COUNT: int = POSTS_PER_PAGE * 2 + 3
+
+
+class FeedFragmentTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        # одинаковое время у всех постов: порядок держится на pk
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=cls.user, group=cls.group)
+            for number in range(POSTS_COUNT)
+        )
+        cls.posts = list(Post.objects.order_by('-pub_date', '-pk'))
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_cursor_round_trip(self):
+        """Курсор восстанавливает время с точностью до микросекунды."""
+        post = self.posts[0]
+        self.assertEqual(
+            decode_cursor(encode_cursor(post)), (post.pub_date, post.pk)
+        )
+
+    def collect(self, url):
+        """Проходит ленту фрагментами до конца; тексты постов."""
+        texts = []
+        while url:
+            response = self.guest_client.get(url)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            texts += [card['post'].text for card in response.context['cards']]
+            url = response.context['next_fragment']
+        return texts
+
+    def test_fragments_continue_feeds(self):
+        """Фрагменты продолжают ленты с места, где кончилась страница."""
+        expected = [post.text for post in self.posts[POSTS_PER_PAGE:]]
+        pages = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.user.username,)),
+        )
+        for url in pages:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertContains(response, 'data-feed-next')
+                self.assertEqual(
+                    self.collect(response.context['next_fragment']), expected
+                )
+
+    @override_settings(FEED_READ_MODEL=True)
+    def test_fragments_from_feed_items(self):
+        """С таблицей ленты фрагменты читают её же."""
+        rebuild_feed()
+        url = reverse('posts:index_fragment') + '?before=' + encode_cursor(
+            self.posts[POSTS_PER_PAGE - 1]
+        )
+        self.assertEqual(
+            self.collect(url),
+            [post.text for post in self.posts[POSTS_PER_PAGE:]],
+        )
+
+    def test_fragment_is_bare_and_cacheable(self):
+        """Фрагмент — только карточки, с публичным кэшем и ETag."""
+        url = reverse('posts:index_fragment') + '?before=' + encode_cursor(
+            self.posts[0]
+        )
+        response = self.guest_client.get(url)
+        self.assertNotContains(response, '<html')
+        self.assertIn('public', response['Cache-Control'])
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+        response = self.guest_client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_bad_cursor(self):
+        """Испорченный курсор — 404."""
+        for cursor in ('', 'abc', '1_2_3', '99999999999999999999999_1'):
+            with self.subTest(cursor=cursor):
+                response = self.guest_client.get(
+                    reverse('posts:index_fragment') + '?before=' + cursor
+                )
+                self.assertTemplateUsed(response, 'core/404.html')
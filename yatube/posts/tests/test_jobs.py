@@ -0,0 +1,119 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..jobs import JOB_CHUNK_SIZE, STALE_JOB_ERROR, start_job
+from ..models import BulkJob, Comment, Group, Post
+from ..signals import posts_changed
+
+User = get_user_model()
+
+
+@override_settings(BULK_JOBS_ASYNC=False)
+class BulkJobTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin'
+        )
+        cls.spammer = User.objects.create_user(username='spammer')
+        cls.user = User.objects.create_user(username='user')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+        self.url = reverse('admin:posts_post_changelist')
+        self.changed = []
+        posts_changed.connect(self.on_posts_changed)
+        self.addCleanup(posts_changed.disconnect, self.on_posts_changed)
+
+    def on_posts_changed(self, sender, post_ids, **kwargs):
+        self.changed.append(list(post_ids))
+
+    def create_posts(self, count, author):
+        Post.objects.bulk_create(
+            Post(text='Спам', author=author) for _ in range(count)
+        )
+        return list(
+            Post.objects.filter(author=author).values_list('pk', flat=True)
+        )
+
+    def test_move_to_group_in_chunks(self):
+        """Перенос в группу идёт пачками с одним сигналом на пачку."""
+        post_ids = self.create_posts(JOB_CHUNK_SIZE + 1, self.spammer)
+        job = start_job(BulkJob.MOVE, post_ids, target_group=self.group)
+        job.refresh_from_db()
+        self.assertEqual(job.status, BulkJob.DONE)
+        self.assertEqual(job.processed, len(post_ids))
+        self.assertEqual(job.progress, 100)
+        self.assertEqual(len(self.changed), 2)
+        self.assertEqual(
+            self.group.posts.count(), JOB_CHUNK_SIZE + 1
+        )
+
+    def test_purge_author_action(self):
+        """Действие админки удаляет посты и комментарии автора."""
+        spam_ids = self.create_posts(3, self.spammer)
+        [own_id] = self.create_posts(1, self.user)
+        Comment.objects.create(
+            post_id=own_id, author=self.spammer, text='Спам'
+        )
+        Comment.objects.create(
+            post_id=own_id, author=self.user, text='Не спам'
+        )
+        self.admin_client.post(self.url, {
+            'action': 'purge_authors',
+            '_selected_action': spam_ids[:1],
+        })
+        job = BulkJob.objects.get()
+        self.assertEqual(job.status, BulkJob.DONE)
+        self.assertEqual(job.total, 4)
+        self.assertFalse(Post.objects.filter(author=self.spammer).exists())
+        self.assertFalse(
+            Comment.objects.filter(author=self.spammer).exists()
+        )
+        self.assertTrue(Post.objects.filter(pk=own_id).exists())
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_move_action_requires_group(self):
+        """Без выбранной группы задача не создаётся."""
+        post_ids = self.create_posts(1, self.spammer)
+        self.admin_client.post(self.url, {
+            'action': 'move_to_group',
+            '_selected_action': post_ids,
+        })
+        self.assertFalse(BulkJob.objects.exists())
+
+    def test_fail_stale_jobs_command(self):
+        """fail_stale_jobs закрывает задачи, потерянные при перезапуске."""
+        pending = BulkJob.objects.create(action=BulkJob.DELETE)
+        running = BulkJob.objects.create(
+            action=BulkJob.DELETE, status=BulkJob.RUNNING
+        )
+        done = BulkJob.objects.create(
+            action=BulkJob.DELETE, status=BulkJob.DONE
+        )
+        call_command('fail_stale_jobs', stdout=StringIO())
+        for job in (pending, running):
+            job.refresh_from_db()
+            self.assertEqual(job.status, BulkJob.FAILED)
+            self.assertEqual(job.error, STALE_JOB_ERROR)
+            self.assertIsNotNone(job.finished)
+        done.refresh_from_db()
+        self.assertEqual(done.status, BulkJob.DONE)
+
+    def test_fail_stale_jobs_skips_fresh(self):
+        """С --older-than свежие задачи не трогаются."""
+        job = BulkJob.objects.create(action=BulkJob.DELETE)
+        call_command('fail_stale_jobs', '--older-than=5', stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, BulkJob.PENDING)
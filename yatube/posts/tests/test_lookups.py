@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.http import Http404
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.objcache import get_object_cache
+
+from ..lookups import cached_object_or_404
+from ..models import Group, Post
+from ..tombstones import delete_post
+
+User = get_user_model()
+
+
+@override_settings(OBJECT_CACHE_ENABLED=True)
+class CachedLookupTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+
+    def setUp(self):
+        get_object_cache().clear()
+        self.addCleanup(get_object_cache().clear)
+
+    def test_second_lookup_skips_database(self):
+        """Повторный поиск группы и автора не обращается к БД."""
+        cached_object_or_404(Group, slug='group')
+        cached_object_or_404(User, username='author')
+        with self.assertNumQueries(0):
+            group = cached_object_or_404(Group, slug='group')
+            user = cached_object_or_404(User, username='author')
+        self.assertEqual(group, self.group)
+        self.assertEqual(user, self.user)
+        self.assertEqual(get_object_cache().stats()['hits'], 2)
+
+    def test_save_invalidates(self):
+        """Сохранение объекта сбрасывает его записи."""
+        group = cached_object_or_404(Group, slug='group')
+        group.title = 'Новое название'
+        group.save()
+        self.assertEqual(
+            cached_object_or_404(Group, slug='group').title, 'Новое название'
+        )
+
+    def test_tombstone_invalidates(self):
+        """Удалённый пост больше не находится."""
+        post = Post.objects.create(text='Текст', author=self.user)
+        cached_object_or_404(Post, pk=post.pk)
+        delete_post(post)
+        with self.assertRaises(Http404):
+            cached_object_or_404(Post, pk=post.pk)
+
+    def test_edit_does_not_use_stale_copy(self):
+        """Правка не затирает просмотры, накопленные после кэширования."""
+        post = Post.objects.create(text='Текст', author=self.user)
+        cached_object_or_404(Post, pk=post.pk)
+        Post.objects.filter(pk=post.pk).update(
+            views=F('views') + 10, score=F('score') + 5
+        )
+        client = Client()
+        client.force_login(self.user)
+        client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.pk}),
+            {'text': 'Новый текст'},
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.text, 'Новый текст')
+        self.assertEqual(post.views, 10)
+        self.assertEqual(post.score, 5)
+
+    def test_write_views_do_not_resurrect_deleted_post(self):
+        """Пост, удалённый мимо кэша, не правится и не комментируется."""
+        post = Post.objects.create(text='Текст', author=self.user)
+        cached_object_or_404(Post, pk=post.pk)
+        Post.objects.filter(pk=post.pk).update(deleted=timezone.now())
+        client = Client()
+        client.force_login(self.user)
+        client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.pk}),
+            {'text': 'Новый текст'},
+        )
+        client.post(
+            reverse('posts:add_comment', kwargs={'post_id': post.pk}),
+            {'text': 'Комментарий'},
+        )
+        post = Post.all_objects.get(pk=post.pk)
+        self.assertIsNotNone(post.deleted)
+        self.assertEqual(post.text, 'Текст')
+        self.assertFalse(post.comments.exists())
@@ -0,0 +1,56 @@
+import time
+
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase
+
+from core.paginator import ElidedPaginator
+
+PER_PAGE: int = 10
+SMALL_PAGES: int = 50
+HUGE_PAGES: int = 100000
+
+
+class ElidedPaginatorTests(SimpleTestCase):
+    def render_navigation(self, num_pages, number):
+        paginator = ElidedPaginator(range(num_pages * PER_PAGE), PER_PAGE)
+        page_obj = paginator.get_page(number)
+        page_obj.page_links = paginator.get_elided_page_range(number)
+        start = time.perf_counter()
+        html = render_to_string(
+            'includes/paginator.html', {'page_obj': page_obj}
+        )
+        return html, time.perf_counter() - start
+
+    def test_elided_range(self):
+        """Навигация содержит края, окно вокруг страницы и многоточия."""
+        paginator = ElidedPaginator(range(100 * PER_PAGE), PER_PAGE)
+        gap = paginator.ELLIPSIS
+        cases = {
+            1: [1, 2, 3, gap, 99, 100],
+            50: [1, 2, gap, 48, 49, 50, 51, 52, gap, 99, 100],
+            100: [1, 2, gap, 98, 99, 100],
+        }
+        for number, expected in cases.items():
+            with self.subTest(number=number):
+                self.assertEqual(
+                    paginator.get_elided_page_range(number), expected
+                )
+        short = ElidedPaginator(range(3 * PER_PAGE), PER_PAGE)
+        self.assertEqual(short.get_elided_page_range(2), [1, 2, 3])
+
+    def test_render_does_not_grow_with_page_count(self):
+        """Размер и время отрисовки не зависят от числа страниц."""
+        # Прогрев кэша шаблонов
+        self.render_navigation(SMALL_PAGES, SMALL_PAGES // 2)
+        small_html, small_time = min(
+            (self.render_navigation(SMALL_PAGES, SMALL_PAGES // 2)
+             for _ in range(5)),
+            key=lambda result: result[1],
+        )
+        huge_html, huge_time = min(
+            (self.render_navigation(HUGE_PAGES, HUGE_PAGES // 2)
+             for _ in range(5)),
+            key=lambda result: result[1],
+        )
+        self.assertLess(len(huge_html), len(small_html) * 1.5)
+        self.assertLess(huge_time, small_time * 5 + 0.01)
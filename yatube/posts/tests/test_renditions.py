@@ -0,0 +1,134 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.storage import InMemoryStorage
+
+from ..models import Post
+from ..renditions import (
+    RENDITION_WIDTHS, generate_renditions, get_renditions, modern_formats,
+)
+from .images import IN_MEMORY_STORAGE, uploaded_image
+
+User = get_user_model()
+
+
+def make_image(name='picture.png'):
+    return uploaded_image(name, 'PNG', (1200, 600))
+
+
+@override_settings(
+    DEFAULT_FILE_STORAGE=IN_MEMORY_STORAGE,
+    THUMBNAIL_STORAGE=IN_MEMORY_STORAGE,
+    THUMBNAIL_DUMMY=False,
+    STREAMING_RESPONSES=False,
+)
+class PostImageRenditionsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(
+            text='Пост с картинкой',
+            author=cls.user,
+            image=make_image(),
+        )
+        # фоновая нарезка стартует после коммита, которого в TestCase нет
+        generate_renditions(cls.post.image)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        InMemoryStorage.clear()
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_pages_render_srcset(self):
+        """Лента и страница поста отдают srcset с ленивой загрузкой."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                content = self.guest_client.get(url).content.decode()
+                self.assertIn('srcset=', content)
+                self.assertIn('sizes=', content)
+                self.assertIn('loading="lazy"', content)
+                for width in RENDITION_WIDTHS:
+                    self.assertIn(f' {width}w', content)
+
+    def test_modern_formats_sources(self):
+        """Для каждого поддерживаемого формата есть свой <source>."""
+        content = self.guest_client.get(reverse('posts:index')).content
+        for image_format in modern_formats():
+            with self.subTest(image_format=image_format):
+                self.assertIn(
+                    f'type="image/{image_format.lower()}"', content.decode()
+                )
+
+    def test_renditions_only_for_new_image(self):
+        """Нарезка запускается при новой картинке, но не при правке текста."""
+        post = Post.objects.create(text='Пост', author=self.user)
+        with mock.patch(
+            'posts.renditions.schedule_renditions'
+        ) as schedule:
+            post.image = make_image('new.png')
+            post.save()
+            self.assertEqual(schedule.call_count, 1)
+            post.text = 'Новый текст'
+            post.save(update_fields=('text', 'group', 'image'))
+            self.assertEqual(schedule.call_count, 1)
+
+    def test_post_without_image(self):
+        """Пост без картинки не выводит <picture>."""
+        post = Post.objects.create(text='Без картинки', author=self.user)
+        response = self.guest_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': post.pk})
+        )
+        self.assertNotIn('<picture>', response.content.decode())
+
+
+@override_settings(
+    DEFAULT_FILE_STORAGE=IN_MEMORY_STORAGE,
+    THUMBNAIL_STORAGE=IN_MEMORY_STORAGE,
+    THUMBNAIL_DUMMY=True,
+)
+class ThumbnailStubTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(
+            text='Пост с картинкой',
+            author=cls.user,
+            image=make_image(),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        InMemoryStorage.clear()
+
+    def test_stub_mode_skips_thumbnails(self):
+        """В режиме заглушек миниатюры не нарезаются и не сохраняются."""
+        renditions = get_renditions(self.post.image)
+        self.assertEqual(
+            [width for width, _ in renditions], list(RENDITION_WIDTHS)
+        )
+        for width, thumbnail in renditions:
+            with self.subTest(width=width):
+                self.assertEqual(thumbnail.width, width)
+        self.assertEqual(InMemoryStorage().listdir('')[0], ['posts'])
+
+    def test_uploads_stay_in_memory(self):
+        """Загруженная картинка лежит в памяти и читается обратно."""
+        storage = self.post.image.storage
+        self.assertIsInstance(storage, InMemoryStorage)
+        self.assertTrue(storage.exists(self.post.image.name))
+        self.assertEqual(
+            storage.open(self.post.image.name).read()[:4], b'\x89PNG'
+        )
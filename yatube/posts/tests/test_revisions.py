@@ -0,0 +1,133 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import revisions
+from ..models import Group, Post, PostRevision
+from ..revisions import (
+    SNAPSHOT_INTERVAL, apply_delta, make_delta, post_state, record_revision,
+    revision_text,
+)
+
+User = get_user_model()
+LONG_TEXT = ''.join(f'Строка номер {number}\n' for number in range(500))
+LONG_LINE = ' '.join(f'слово{number}' for number in range(300))
+
+
+class RevisionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.other = User.objects.create_user(username='other')
+        cls.moderator = User.objects.create_user(
+            username='moderator', is_staff=True
+        )
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+
+    def setUp(self):
+        self.post = Post.objects.create(text='Первая версия', author=self.user)
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+
+    def edit(self, post, text, group=None):
+        old_state = post_state(post)
+        post.text = text
+        post.group = group
+        post.save()
+        return record_revision(post, old_state, editor=self.user)
+
+    def test_delta_roundtrip_is_compact(self):
+        """Дельта восстанавливает текст и пропорциональна правке."""
+        new_text = LONG_TEXT.replace('Строка номер 250\n', 'Правка\n')
+        delta = make_delta(LONG_TEXT, new_text)
+        self.assertEqual(apply_delta(LONG_TEXT, delta), new_text)
+        self.assertLess(len(delta), 50)
+
+    def test_delta_on_single_line_is_compact(self):
+        """Правка слова в посте из одной длинной строки не копирует её."""
+        new_text = LONG_LINE.replace('слово150', 'правка')
+        delta = make_delta(LONG_LINE, new_text)
+        self.assertEqual(apply_delta(LONG_LINE, delta), new_text)
+        self.assertLess(len(delta), 50)
+
+    def test_rewrite_is_stored_as_snapshot(self):
+        """Переписанный текст хранится снимком, а не дельтой длиннее его."""
+        self.edit(self.post, LONG_LINE)
+        self.edit(self.post, LONG_LINE.replace('слово150', 'правка'))
+        self.edit(self.post, 'Совсем другой текст')
+        revisions = list(self.post.revisions.order_by('number'))
+        self.assertEqual(
+            [revision.is_snapshot for revision in revisions],
+            [True, True, False, True],
+        )
+        self.assertEqual(revisions[3].text, 'Совсем другой текст')
+        self.assertEqual(
+            revision_text(self.post, 3),
+            LONG_LINE.replace('слово150', 'правка'),
+        )
+
+    def test_edit_view_records_history(self):
+        """Правка через форму сохраняет исходную и новую версии."""
+        self.author_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            {'text': 'Вторая версия', 'group': self.group.pk},
+        )
+        first, second = self.post.revisions.order_by('number')
+        self.assertTrue(first.is_snapshot)
+        self.assertEqual(first.text, 'Первая версия')
+        self.assertIsNone(first.group_id)
+        self.assertEqual(second.group_id, self.group.pk)
+        self.assertEqual(second.editor, self.user)
+        self.assertEqual(revision_text(self.post, 2), 'Вторая версия')
+
+    def test_unchanged_save_is_not_recorded(self):
+        """Сохранение без изменений не создаёт версию."""
+        self.assertIsNone(
+            record_revision(self.post, post_state(self.post))
+        )
+        self.assertFalse(PostRevision.objects.exists())
+
+    def test_reading_is_bounded(self):
+        """Любая версия читается из снимка и ограниченного числа дельт."""
+        texts = {1: self.post.text}
+        text = LONG_TEXT
+        for number in range(2, SNAPSHOT_INTERVAL * 2 + 5):
+            text = text.replace(f'номер {number}\n', f'правка {number}\n')
+            self.edit(self.post, text)
+            texts[number] = text
+        for number, expected in texts.items():
+            with self.subTest(number=number):
+                with mock.patch.object(
+                    revisions, 'apply_delta', wraps=apply_delta
+                ) as applied, self.assertNumQueries(2):
+                    self.assertEqual(
+                        revision_text(self.post, number), expected
+                    )
+                self.assertLess(applied.call_count, SNAPSHOT_INTERVAL)
+
+    def test_history_access(self):
+        """Историю видят автор и модераторы, но не другие пользователи."""
+        self.edit(self.post, 'Вторая версия', self.group)
+        url = reverse('posts:post_history', kwargs={'post_id': self.post.pk})
+        for user, allowed in (
+            (self.user, True), (self.moderator, True), (self.other, False)
+        ):
+            with self.subTest(user=user.username):
+                client = Client()
+                client.force_login(user)
+                response = client.get(url, {'revision': 1})
+                if allowed:
+                    self.assertContains(response, 'Первая версия')
+                else:
+                    self.assertRedirects(
+                        response,
+                        reverse(
+                            'posts:post_detail',
+                            kwargs={'post_id': self.post.pk},
+                        ),
+                    )
@@ -0,0 +1,51 @@
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+from django.urls import include, path, reverse
+
+from ..routes import posts_reverse
+
+urlpatterns = [
+    path('blog/', include('posts.urls', namespace='posts')),
+]
+
+
+class PostsReverseTests(SimpleTestCase):
+    def test_matches_django_reverse(self):
+        """posts_reverse строит те же адреса, что и reverse."""
+        cases = (
+            ('index', ()),
+            ('trending', ()),
+            ('group_list', ('test-slug',)),
+            ('profile', ('author',)),
+            ('profile', ('Лев Толстой',)),
+            ('post_detail', (7,)),
+            ('post_edit', (7,)),
+            ('add_comment', (7,)),
+            ('post_create', ()),
+        )
+        for name, args in cases:
+            with self.subTest(name=name, args=args):
+                self.assertEqual(
+                    posts_reverse(name, *args),
+                    reverse(f'posts:{name}', args=args),
+                )
+        self.assertEqual(
+            posts_reverse('post_detail', post_id=7),
+            reverse('posts:post_detail', kwargs={'post_id': 7}),
+        )
+
+    def test_reset_on_urlconf_change(self):
+        """После смены URLconf шаблоны маршрутов пересобираются."""
+        self.assertEqual(posts_reverse('post_detail', 1), '/posts/1/')
+        with override_settings(ROOT_URLCONF=__name__):
+            self.assertEqual(
+                posts_reverse('post_detail', 1), '/blog/posts/1/'
+            )
+        self.assertEqual(posts_reverse('post_detail', 1), '/posts/1/')
+
+    def test_template_tag(self):
+        """Тег posts_url выводит адрес с экранированием."""
+        html = Template(
+            "{% load post_urls %}{% posts_url 'profile' username %}"
+        ).render(Context({'username': 'a&b'}))
+        self.assertEqual(html, '/profile/a&amp;b/')
@@ -0,0 +1,71 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Comment, Group, Post
+from ..views import POSTS_PER_PAGE, STREAM_CHUNK
+
+User = get_user_model()
+
+
+def squash(html):
+    return re.sub(r'\s+', '', html)
+
+
+@override_settings(STREAMING_RESPONSES=False)
+class StreamingResponseTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='author', first_name='Лев', last_name='Толстой'
+        )
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=cls.user, score=number + 1,
+                 group=cls.group if number % 2 else None)
+            for number in range(POSTS_PER_PAGE + 1)
+        )
+        cls.post = Post.objects.first()
+        Comment.objects.bulk_create(
+            Comment(text=f'Комментарий {number}', author=cls.user,
+                    post=cls.post)
+            for number in range(STREAM_CHUNK * 2 + 1)
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_streamed_pages_match_buffered(self):
+        """Потоковые страницы совпадают с обычными."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.user.username,)),
+            reverse('posts:trending'),
+            reverse('posts:post_detail', args=(self.post.pk,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                buffered = self.guest_client.get(url)
+                self.assertFalse(buffered.streaming)
+                with override_settings(STREAMING_RESPONSES=True):
+                    streamed = self.guest_client.get(url)
+                    content = b''.join(streamed.streaming_content)
+                self.assertTrue(streamed.streaming)
+                self.assertEqual(
+                    squash(content.decode()),
+                    squash(buffered.content.decode()),
+                )
+
+    @override_settings(STREAMING_RESPONSES=True)
+    def test_head_goes_first(self):
+        """Шапка страницы уходит до карточек."""
+        response = self.guest_client.get(reverse('posts:index'))
+        first = next(iter(response.streaming_content)).decode()
+        self.assertIn('<h1>', first)
+        self.assertNotIn('<article>', first)
@@ -0,0 +1,108 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..archive import ALL_SCOPE
+from ..models import Comment, MonthlyPostCount, Post
+from ..tombstones import purge_deleted
+
+User = get_user_model()
+
+
+class SoftDeleteTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+
+    def setUp(self):
+        self.post = Post.objects.create(text='Пост', author=self.user)
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def add_comments(self, post, count):
+        Comment.objects.bulk_create(
+            Comment(post=post, author=self.reader, text='Комментарий')
+            for _ in range(count)
+        )
+
+    def delete_url(self, post):
+        return reverse('posts:post_delete', kwargs={'post_id': post.pk})
+
+    def test_delete_hides_post_and_comments(self):
+        """Удалённый пост пропадает из ленты, страницы поста и счётчиков."""
+        self.add_comments(self.post, 3)
+        self.author_client.post(self.delete_url(self.post))
+        self.assertFalse(Post.objects.filter(pk=self.post.pk).exists())
+        self.assertTrue(Post.all_objects.filter(pk=self.post.pk).exists())
+        self.assertEqual(Comment.all_objects.count(), 3)
+        response = self.reader_client.get(reverse('posts:index'))
+        self.assertEqual(len(response.context['page_obj']), 0)
+        response = self.reader_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        )
+        self.assertTemplateUsed(response, 'core/404.html')
+        self.assertEqual(self.user.posts.count(), 0)
+        self.assertFalse(
+            MonthlyPostCount.objects.filter(
+                scope=ALL_SCOPE, count__gt=0
+            ).exists()
+        )
+
+    def test_delete_cost_does_not_depend_on_comments(self):
+        """Удаление поста с длинным обсуждением не дороже пустого."""
+        busy_post = Post.objects.create(text='Обсуждаемый', author=self.user)
+        self.add_comments(busy_post, 50)
+        queries = []
+        for post in (self.post, busy_post):
+            with CaptureQueriesContext(connection) as context:
+                self.author_client.post(self.delete_url(post))
+            queries.append(len(context))
+        self.assertEqual(queries[0], queries[1])
+
+    def test_only_author_deletes(self):
+        """Чужой пост удалить нельзя."""
+        self.reader_client.post(self.delete_url(self.post))
+        self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
+
+    def test_delete_comment(self):
+        """Автор комментария может его скрыть."""
+        comment = Comment.objects.create(
+            post=self.post, author=self.reader, text='Комментарий'
+        )
+        self.reader_client.post(reverse('posts:comment_delete', kwargs={
+            'post_id': self.post.pk, 'comment_id': comment.pk,
+        }))
+        self.assertFalse(self.post.comments.exists())
+        self.assertTrue(Comment.all_objects.filter(pk=comment.pk).exists())
+
+    def test_purge_in_batches(self):
+        """purge_deleted удаляет надгробия пачками, свежие оставляет."""
+        self.add_comments(self.post, 5)
+        fresh = Post.objects.create(text='Свежий', author=self.user)
+        self.author_client.post(self.delete_url(self.post))
+        self.author_client.post(self.delete_url(fresh))
+        Post.all_objects.filter(pk=self.post.pk).update(
+            deleted=timezone.now() - timedelta(days=2)
+        )
+        self.assertEqual(
+            purge_deleted(older_than=timedelta(days=1), batch_size=2), (5, 1)
+        )
+        self.assertEqual(Comment.all_objects.count(), 0)
+        self.assertEqual(
+            list(Post.all_objects.values_list('pk', flat=True)), [fresh.pk]
+        )
+        out = StringIO()
+        call_command('purge_deleted', older_than=0, pause=0, stdout=out)
+        self.assertFalse(Post.all_objects.exists())
+        self.assertIn('постов: 1', out.getvalue())
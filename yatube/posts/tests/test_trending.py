@@ -0,0 +1,62 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Comment, Post
+from ..trending import COMMENT_WEIGHT, VIEW_WEIGHT, add_scores
+
+User = get_user_model()
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.quiet_post = Post.objects.create(text='Тихий', author=cls.user)
+        cls.hot_post = Post.objects.create(text='Горячий', author=cls.user)
+        cls.cold_post = Post.objects.create(text='Холодный', author=cls.user)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_comment_increments_score(self):
+        """Новый комментарий увеличивает рейтинг поста."""
+        Comment.objects.create(
+            post=self.hot_post, author=self.user, text='Комментарий'
+        )
+        self.hot_post.refresh_from_db()
+        self.assertEqual(self.hot_post.score, COMMENT_WEIGHT)
+
+    def test_add_scores_in_one_update(self):
+        """Веса нескольких постов прибавляются одним запросом."""
+        with self.assertNumQueries(1):
+            add_scores({self.quiet_post.pk: 1, self.hot_post.pk: 10})
+        self.quiet_post.refresh_from_db()
+        self.hot_post.refresh_from_db()
+        self.assertEqual(self.quiet_post.score, 1)
+        self.assertEqual(self.hot_post.score, 10)
+
+    def test_decay_command(self):
+        """decay_scores уменьшает рейтинг и обнуляет совсем малый."""
+        add_scores({self.hot_post.pk: 10, self.quiet_post.pk: VIEW_WEIGHT})
+        call_command('decay_scores', factor=0.5, stdout=StringIO())
+        call_command('decay_scores', factor=0.05, stdout=StringIO())
+        self.hot_post.refresh_from_db()
+        self.assertAlmostEqual(self.hot_post.score, 0.25)
+        call_command('decay_scores', stdout=StringIO())
+        self.quiet_post.refresh_from_db()
+        self.assertEqual(self.quiet_post.score, 0)
+
+    def test_trending_page_ordering(self):
+        """Популярное отсортировано по рейтингу, без постов с нулём."""
+        add_scores({self.quiet_post.pk: 1, self.hot_post.pk: 10})
+        response = self.guest_client.get(reverse('posts:trending'))
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [self.hot_post, self.quiet_post],
+        )
+        self.assertTemplateUsed(response, 'posts/trending.html')
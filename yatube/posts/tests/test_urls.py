@@ -53,7 +53,7 @@ class PostURLTests(TestCase):
 
     def test_posts_post_id_url_at_desired_location(self):
         """Страница /profile/post_id/ доступна любому пользователю."""
-        response = self.guest_client.get('/posts/1/')
+        response = self.guest_client.get(f'/posts/{self.post.pk}/')
         self.assertEqual(response.status_code, HTTPStatus.OK)
 
     def test_some_strange_url_not_found(self):
@@ -63,7 +63,7 @@ class PostURLTests(TestCase):
 
     def test_posts_post_id_edit_url_at_desired_location(self):
         """Страница /profile/post_id/edit/ доступна автору поста."""
-        response = self.authorized_client.get('/posts/1/edit/')
+        response = self.authorized_client.get(f'/posts/{self.post.pk}/edit/')
         self.assertEqual(response.status_code, HTTPStatus.OK)
 
     def test_post_create_url_exists_at_desired_location(self):
@@ -73,7 +73,9 @@ class PostURLTests(TestCase):
 
     def test_posts_post_id_edit_url_inaccessible_for_authorized_client(self):
         """Страница /profile/post_id/edit/ недоступна неавтору поста."""
-        response = self.authorized_client_not_author.get('/posts/1/edit/')
+        response = self.authorized_client_not_author.get(
+            f'/posts/{self.post.pk}/edit/'
+        )
         self.assertEqual(response.status_code, HTTPStatus.FOUND)
 
     def test_post_create_url_inaccessible_for_guest_client(self):
@@ -83,7 +85,7 @@ class PostURLTests(TestCase):
 
     def test_post_edit_url_inaccessible_for_guest_client(self):
         """Гость не имеет доступа к странице редактирования поста."""
-        response = self.guest_client.get('/posts/1/edit/')
+        response = self.guest_client.get(f'/posts/{self.post.pk}/edit/')
         self.assertEqual(response.status_code, HTTPStatus.FOUND)
 
     def test_urls_uses_correct_templates(self):
@@ -92,9 +94,9 @@ class PostURLTests(TestCase):
             '/': 'posts/index.html',
             '/group/test-slug/': 'posts/group_list.html',
             '/profile/author/': 'posts/profile.html',
-            '/posts/1/': 'posts/post_detail.html',
+            f'/posts/{self.post.pk}/': 'posts/post_detail.html',
             '/create/': 'posts/create_post.html',
-            '/posts/1/edit/': 'posts/create_post.html',
+            f'/posts/{self.post.pk}/edit/': 'posts/create_post.html',
         }
         for address, template in templates_url_names.items():
             with self.subTest(address=address):
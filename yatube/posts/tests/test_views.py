@@ -1,6 +1,6 @@
 from django import forms
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
 from ..models import Group, Post
@@ -10,6 +10,7 @@ NUMBER_OF_TESTED_PAGES: int = 13
 User = get_user_model()
 
 
+@override_settings(STREAMING_RESPONSES=False)
 class PostPagesTests(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -99,6 +100,25 @@ class PostPagesTests(TestCase):
         profile_object = response.context['profile']
         self.assertEqual(profile_object, self.user)
 
+    def test_feed_cards_show_correct_context(self):
+        """Карточки ленты содержат готовые ссылки на автора, пост и группу."""
+        response = self.guest_client.get(reverse('posts:index'))
+        card = response.context['page_obj'].cards[0]
+        self.assertEqual(card['post'], self.post)
+        self.assertEqual(
+            card['profile_url'],
+            reverse('posts:profile', kwargs={'username': self.user}),
+        )
+        self.assertEqual(
+            card['detail_url'],
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id}),
+        )
+        self.assertEqual(
+            card['group_url'],
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+        )
+        self.assertContains(response, card['detail_url'])
+
     def test_post_detail_show_correct_context(self):
         """Шаблон post_detail сформирован с правильным контекстом."""
         response = self.authorized_client.get(
@@ -147,6 +167,7 @@ class PostPagesTests(TestCase):
         self.assertTrue(response.context.get('is_edit'))
 
 
+@override_settings(STREAMING_RESPONSES=False)
 class PaginatorViewsTest(TestCase):
     """Тестируется paginator."""
 
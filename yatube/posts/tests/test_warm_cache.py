@@ -0,0 +1,93 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.storage import InMemoryStorage
+
+from ..management.commands.warm_cache import feed_images
+from ..models import Group, Post
+from ..renditions import RENDITIONS_CACHE_PREFIX
+from ..views import POSTS_PER_PAGE
+from .images import IN_MEMORY_STORAGE, uploaded_image
+
+User = get_user_model()
+
+
+@override_settings(
+    DEFAULT_FILE_STORAGE=IN_MEMORY_STORAGE,
+    THUMBNAIL_STORAGE=IN_MEMORY_STORAGE,
+    THUMBNAIL_DUMMY=True,
+)
+class WarmCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.quiet = User.objects.create_user(username='quiet')
+        cls.popular = User.objects.create_user(username='popular')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.old = Post.objects.create(
+            text='Текст', author=cls.quiet, image=uploaded_image('old.gif')
+        )
+        Post.objects.filter(pk=cls.old.pk).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+        Post.objects.bulk_create(
+            Post(text='Текст', author=cls.quiet)
+            for _ in range(POSTS_PER_PAGE)
+        )
+        cls.hot = Post.objects.create(
+            text='Текст', author=cls.popular, group=cls.group, score=50,
+            image=uploaded_image('hot.gif'),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        InMemoryStorage.clear()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_images_from_first_pages_of_hot_feeds(self):
+        """Картинки берутся с первых страниц горячих лент по одному разу."""
+        since = timezone.now() - timedelta(days=7)
+        images = feed_images(since, groups=5, profiles=5, pages=1)
+        self.assertEqual(
+            [image.name for image in images], [self.hot.image.name]
+        )
+
+    def test_command_warms_renditions(self):
+        """Контексты картинок оказываются в кэше."""
+        out = StringIO()
+        call_command('warm_cache', pages=2, stdout=out)
+        self.assertIn('Картинок нарезано: 2', out.getvalue())
+        for post in (self.old, self.hot):
+            with self.subTest(image=post.image.name):
+                self.assertIsNotNone(
+                    cache.get(RENDITIONS_CACHE_PREFIX + post.image.name)
+                )
+
+    def test_process_local_cache_skips_directory(self):
+        """С кэшем в памяти процесса каталог групп не прогревается."""
+        out = StringIO()
+        call_command('warm_cache', stdout=out)
+        self.assertIn('LocMemCache', out.getvalue())
+        self.assertNotIn('Страниц каталога групп', out.getvalue())
+
+    def test_shared_cache_warms_directory(self):
+        """С общим кэшем прогреваются и страницы каталога групп."""
+        out = StringIO()
+        with mock.patch(
+            'posts.management.commands.warm_cache.shared_cache',
+            return_value=True,
+        ):
+            call_command('warm_cache', stdout=out)
+        self.assertIn('Страниц каталога групп: 1', out.getvalue())
@@ -0,0 +1,76 @@
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import archive
+from .models import Comment, Post
+from .signals import posts_changed
+
+PURGE_BATCH_SIZE: int = 200
+
+
+def delete_posts(post_ids):
+    """Помечает посты удалёнными одним UPDATE.
+
+    Комментарии не трогаются: они скрываются вместе с постом, а
+    физически удаляются позже командой purge_deleted. Поэтому время
+    удаления не зависит от длины обсуждения. posts_changed отправляет
+    вызывающий: фоновые задачи шлют его один раз на пачку.
+    """
+    with transaction.atomic():
+        posts = Post.objects.filter(pk__in=list(post_ids))
+        values = list(posts.values_list('group_id', 'author_id', 'pub_date'))
+        posts.update(deleted=timezone.now())
+        archive.remove_posts(values)
+
+
+def delete_post(post):
+    delete_posts([post.pk])
+    posts_changed.send(sender=Post, post_ids=[post.pk])
+
+
+def delete_comments(comment_ids):
+    """Помечает комментарии удалёнными; возвращает id их постов."""
+    comments = Comment.objects.filter(pk__in=list(comment_ids))
+    post_ids = list(comments.values_list('post_id', flat=True).distinct())
+    comments.update(deleted=timezone.now())
+    return post_ids
+
+
+def purge_batches(queryset, batch_size, pause):
+    """Удаляет строки queryset пачками, каждую в своей транзакции."""
+    purged = 0
+    while True:
+        batch = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return purged
+        with transaction.atomic():
+            queryset.model.all_objects.filter(pk__in=batch).delete()
+        purged += len(batch)
+        if pause:
+            # даём другим писателям SQLite взять блокировку
+            time.sleep(pause)
+
+
+def purge_deleted(older_than=timedelta(0), batch_size=PURGE_BATCH_SIZE,
+                  pause=0):
+    """Физически удаляет помеченное удалённым раньше older_than назад.
+
+    Сначала комментарии (свои надгробия и комментарии удалённых
+    постов), затем сами посты: каскад на пачке постов уже пуст.
+    """
+    cutoff = timezone.now() - older_than
+    comments = purge_batches(
+        Comment.all_objects.filter(
+            Q(deleted__lte=cutoff) | Q(post__deleted__lte=cutoff)
+        ),
+        batch_size,
+        pause,
+    )
+    posts = purge_batches(
+        Post.all_objects.filter(deleted__lte=cutoff), batch_size, pause
+    )
+    return comments, posts
@@ -0,0 +1,33 @@
+from django.db.models import F, FloatField
+
+from core.db import case_by_pk
+
+from .models import Post
+
+COMMENT_WEIGHT: float = 3.0
+VIEW_WEIGHT: float = 0.1
+# decay_scores запускается раз в час: рейтинг уменьшается вдвое за сутки
+SCORE_HALF_LIFE_RUNS: int = 24
+SCORE_DECAY: float = 0.5 ** (1 / SCORE_HALF_LIFE_RUNS)
+# Ниже этого порога пост выпадает из популярного
+SCORE_EPSILON: float = 0.01
+
+
+def add_scores(weights):
+    """Одним UPDATE ... CASE прибавляет веса {post_id: вес} к рейтингу."""
+    weights = {pk: weight for pk, weight in weights.items() if weight}
+    if not weights:
+        return 0
+    return Post.objects.filter(pk__in=weights).update(
+        score=F('score') + case_by_pk(weights, FloatField(), 0.0)
+    )
+
+
+def decay_scores(factor=SCORE_DECAY):
+    """Затухание рейтинга; трогает только посты с ненулевым рейтингом."""
+    Post.objects.filter(score__gt=0, score__lt=SCORE_EPSILON).update(score=0)
+    return Post.objects.filter(score__gt=0).update(score=F('score') * factor)
+
+
+def trending_posts():
+    return Post.objects.filter(score__gt=0).order_by('-score')
@@ -6,12 +6,51 @@ app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path(
+        'archive/<int:year>/<int:month>/', views.index, name='index_archive'
+    ),
+    path('fragment/', views.index_fragment, name='index_fragment'),
+    path('trending/', views.trending, name='trending'),
+    path('groups/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
+    path(
+        'group/<slug:slug>/archive/<int:year>/<int:month>/',
+        views.group_posts,
+        name='group_archive',
+    ),
+    path(
+        'group/<slug:slug>/fragment/',
+        views.group_fragment,
+        name='group_fragment',
+    ),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path(
+        'profile/<str:username>/fragment/',
+        views.profile_fragment,
+        name='profile_fragment',
+    ),
+    path(
+        'profile/<str:username>/archive/<int:year>/<int:month>/',
+        views.profile,
+        name='profile_archive',
+    ),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path(
+        'posts/<int:post_id>/history/',
+        views.post_history,
+        name='post_history',
+    ),
+    path(
+        'posts/<int:post_id>/delete/', views.post_delete, name='post_delete'
+    ),
     path('create/', views.post_create, name='post_create'),
     path(
         'posts/<int:post_id>/comment/', views.add_comment, name='add_comment'
     ),
+    path(
+        'posts/<int:post_id>/comments/<int:comment_id>/delete/',
+        views.comment_delete,
+        name='comment_delete',
+    ),
 ]
@@ -1,68 +1,294 @@
+import datetime
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.db import transaction
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import get_template, render_to_string
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, set_response_etag,
+)
+from django.views.decorators.http import require_POST
+
+from core.budget import query_budget
+from core.paginator import ElidedPaginator, before_cursor, encode_cursor
+from core.ratelimit import ratelimit
+from core.streaming import streaming_render
 
+from .archive import ALL_SCOPE, archive_links, author_scope, group_scope
+from .cards import build_cards, build_feed_cards
+from .counters import view_counter
+from .directory import group_directory_page
 from .forms import CommentForm, PostForm
-from .models import Comment, Group, Post, User
+from .jobs import chunked
+from .lookups import cached_object_or_404
+from .models import Comment, FeedItem, Group, Post, User
+from .revisions import post_state, record_revision, revision_text
+from .routes import posts_reverse
+from .tombstones import delete_comments, delete_post
+from .trending import trending_posts
 
 POSTS_PER_PAGE: int = 10
+# столько карточек или комментариев рисуется за одну часть потока
+STREAM_CHUNK: int = 5
+# фрагменты ленты меняются только при правке и удалении постов
+FRAGMENT_MAX_AGE: int = 60
 
 
 def pagination(request, object_list, per_page=POSTS_PER_PAGE):
-    paginator = Paginator(object_list, per_page)
+    paginator = ElidedPaginator(object_list, per_page)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    # Навигация считается один раз здесь, а шаблон её только выводит
+    page_obj.page_links = paginator.get_elided_page_range(page_obj.number)
+    return page_obj
+
+
+def feed_posts(**filters):
+    """Посты ленты: из таблицы FeedItem, если она включена."""
+    if settings.FEED_READ_MODEL:
+        return FeedItem.objects.filter(**filters).order_by('-pub_date', '-pk')
+    return Post.objects.filter(**filters).order_by('-pub_date', '-pk')
+
+
+def card_source(object_list):
+    """Выборка со связями, нужными карточкам, и функция их сборки."""
+    if object_list.model is FeedItem:
+        return object_list, build_feed_cards
+    return object_list.select_related('author', 'group'), build_cards
+
+
+def feed_pagination(request, object_list):
+    """Страница ленты; карточки собирает feed_response."""
+    object_list, build = card_source(object_list)
+    page_obj = pagination(request, object_list=object_list)
+    page_obj.build_cards = build
     return page_obj
 
 
-def index(request):
+def stream_cards(page_obj, flags):
+    """Карточки страницы пачками: каждая рисуется перед отправкой."""
+    template = get_template('includes/feed_cards.html')
+    for number, posts in enumerate(chunked(list(page_obj), STREAM_CHUNK)):
+        yield template.render({
+            'cards': page_obj.build_cards(posts),
+            'continued': number > 0,
+            **flags,
+        })
+
+
+def feed_response(request, template, context, **flags):
+    """Ответ со страницей ленты, при STREAMING_RESPONSES — потоковый."""
+    page_obj = context['page_obj']
+    if not settings.STREAMING_RESPONSES or not page_obj.object_list:
+        page_obj.cards = page_obj.build_cards(page_obj)
+        return render(request, template, context)
+    return streaming_render(
+        request, template, context, stream_cards(page_obj, flags)
+    )
+
+
+def fragment_url(last, route, *args):
+    """Адрес фрагмента с продолжением ленты после поста last."""
+    return f'{posts_reverse(route, *args)}?before={encode_cursor(last)}'
+
+
+def next_fragment(page_obj, route, *args):
+    if not page_obj.has_next():
+        return None
+    return fragment_url(page_obj[-1], route, *args)
+
+
+def feed_fragment(request, posts, route, *args, **flags):
+    """Только карточки следующих POSTS_PER_PAGE постов после курсора.
+
+    Ответ не зависит от пользователя, поэтому собирается без request
+    (сессия не читается, нет Vary: Cookie) и кэшируется публично.
+    """
+    try:
+        posts = before_cursor(posts, request.GET.get('before', ''))
+    except (ValueError, OverflowError):
+        raise Http404
+    posts, build = card_source(posts)
+    posts = list(posts[:POSTS_PER_PAGE + 1])
+    next_url = None
+    if len(posts) > POSTS_PER_PAGE:
+        posts = posts[:POSTS_PER_PAGE]
+        next_url = fragment_url(posts[-1], route, *args)
+    context = {
+        'cards': build(posts),
+        'continued': True,
+        'next_fragment': next_url,
+        **flags,
+    }
+    response = HttpResponse(
+        render_to_string('includes/feed_fragment.html', context)
+    )
+    patch_cache_control(response, public=True, max_age=FRAGMENT_MAX_AGE)
+    set_response_etag(response)
+    return get_conditional_response(
+        request, etag=response['ETag'], response=response
+    )
+
+
+def month_posts(posts, year, month):
+    """Посты выбранного месяца архива или все, если месяц не задан."""
+    if year is None:
+        return posts, None
+    if not (1 <= month <= 12 and datetime.MINYEAR <= year <= datetime.MAXYEAR):
+        raise Http404
+    return (
+        posts.filter(pub_date__year=year, pub_date__month=month),
+        datetime.date(year, month, 1),
+    )
+
+
+@query_budget(queries=6, ms=250)
+def index(request, year=None, month=None):
     template = 'posts/index.html'
-    post_list = Post.objects.all()
-    page_obj = pagination(request, object_list=post_list)
+    post_list, archive_month = month_posts(feed_posts(), year, month)
+    page_obj = feed_pagination(request, object_list=post_list)
+    context = {
+        'page_obj': page_obj,
+        'archive_month': archive_month,
+        'archive': archive_links(ALL_SCOPE, 'index_archive'),
+        'next_fragment': None if archive_month else next_fragment(
+            page_obj, 'index_fragment'
+        ),
+    }
+    return feed_response(
+        request, template, context,
+        show_group_link=True, show_author_link=True,
+    )
+
+
+@query_budget(queries=4, ms=250)
+def index_fragment(request):
+    return feed_fragment(
+        request, feed_posts(), 'index_fragment',
+        show_group_link=True, show_author_link=True,
+    )
+
+
+@query_budget(queries=4, ms=250)
+def trending(request):
+    template = 'posts/trending.html'
+    post_list = trending_posts()
+    page_obj = feed_pagination(request, object_list=post_list)
+    context = {
+        'page_obj': page_obj,
+    }
+    return feed_response(
+        request, template, context,
+        show_group_link=True, show_author_link=True,
+    )
+
+
+@query_budget(queries=4, ms=250)
+def group_index(request):
+    template = 'posts/group_index.html'
+    page_obj = group_directory_page(request.GET.get('page'))
     context = {
         'page_obj': page_obj,
     }
     return render(request, template, context)
 
 
-def group_posts(request, slug):
+@query_budget(queries=7, ms=250)
+def group_posts(request, slug, year=None, month=None):
     template = 'posts/group_list.html'
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
-    page_obj = pagination(request, object_list=posts)
+    group = cached_object_or_404(Group, slug=slug)
+    posts, archive_month = month_posts(
+        feed_posts(group=group), year, month
+    )
+    page_obj = feed_pagination(request, object_list=posts)
     context = {
         'group': group,
         'page_obj': page_obj,
+        'archive_month': archive_month,
+        'archive': archive_links(
+            group_scope(group.pk), 'group_archive', group.slug
+        ),
+        'next_fragment': None if archive_month else next_fragment(
+            page_obj, 'group_fragment', group.slug
+        ),
     }
-    return render(request, template, context)
+    return feed_response(request, template, context, show_author_link=True)
+
+
+@query_budget(queries=4, ms=250)
+def group_fragment(request, slug):
+    group = cached_object_or_404(Group, slug=slug)
+    return feed_fragment(
+        request, feed_posts(group=group), 'group_fragment', group.slug,
+        show_author_link=True,
+    )
 
 
-def profile(request, username):
+@query_budget(queries=8, ms=250)
+def profile(request, username, year=None, month=None):
     template = 'posts/profile.html'
-    profile = get_object_or_404(User, username=username)
-    posts = profile.posts.all()
-    page_obj = pagination(request, object_list=posts)
+    profile = cached_object_or_404(User, username=username)
+    posts, archive_month = month_posts(
+        feed_posts(author=profile), year, month
+    )
+    page_obj = feed_pagination(request, object_list=posts)
     context = {
         'profile': profile,
         'page_obj': page_obj,
+        'archive_month': archive_month,
+        'archive': archive_links(
+            author_scope(profile.pk), 'profile_archive', profile.username
+        ),
+        'next_fragment': None if archive_month else next_fragment(
+            page_obj, 'profile_fragment', profile.username
+        ),
     }
-    return render(request, template, context)
+    return feed_response(request, template, context, show_group_link=True)
+
+
+@query_budget(queries=4, ms=250)
+def profile_fragment(request, username):
+    profile = cached_object_or_404(User, username=username)
+    return feed_fragment(
+        request, feed_posts(author=profile), 'profile_fragment',
+        profile.username, show_group_link=True,
+    )
 
 
+@query_budget(queries=8, ms=250)
 def post_detail(request, post_id):
     template = 'posts/post_detail.html'
-    post = get_object_or_404(Post, pk=post_id)
+    post = cached_object_or_404(Post, pk=post_id)
+    view_counter.hit(post.pk)
     form = CommentForm(request.POST or None)
-    comments = Comment.objects.filter(post=post)
+    comments = Comment.objects.filter(post=post).select_related('author')
     context = {
         'post': post,
         'form': form,
         'comments': comments,
     }
-    return render(request, template, context)
+    if not settings.STREAMING_RESPONSES:
+        return render(request, template, context)
+    return streaming_render(
+        request, template, context, stream_comments(request, post, comments)
+    )
+
 
+def stream_comments(request, post, comments):
+    """Комментарии пачками: длинное обсуждение не задерживает начало."""
+    template = get_template('includes/comments.html')
+    for chunk in chunked(list(comments), STREAM_CHUNK):
+        yield template.render({'post': post, 'comments': chunk}, request)
 
+
+# Худший случай — 22 запроса: первый пост месяца заводит три корзины
+# архива и строку ленты (FEED_READ_MODEL); нарезка картинки — после
+# коммита, в фоне
+@query_budget(queries=24, ms=500)
 @login_required
+@ratelimit('20/m')
 def post_create(request):
     template = 'posts/create_post.html'
     form = PostForm(
@@ -78,6 +304,9 @@ def post_create(request):
     return render(request, template, context)
 
 
+# Худший случай — 26 запросов: перенос в группу без корзины архива за
+# месяц, ревизия и пересборка строки ленты (FEED_READ_MODEL)
+@query_budget(queries=28, ms=500)
 @login_required
 def post_edit(request, post_id):
     template = 'posts/create_post.html'
@@ -86,13 +315,18 @@ def post_edit(request, post_id):
         return redirect(
             'posts:post_detail', post_id=post_id
         )
+    old_state = post_state(post)
     form = PostForm(
         request.POST or None,
         files=request.FILES or None,
         instance=post
     )
     if form.is_valid():
-        form.save()
+        with transaction.atomic():
+            post = form.save(commit=False)
+            # счётчики и пометку удаления пишут другие процессы
+            post.save(update_fields=form.Meta.fields)
+            record_revision(post, old_state, editor=request.user)
         return redirect(
             'posts:post_detail', post_id=post_id
         )
@@ -103,7 +337,31 @@ def post_edit(request, post_id):
     return render(request, template, context)
 
 
+@query_budget(queries=8, ms=250)
+@login_required
+def post_history(request, post_id):
+    template = 'posts/post_history.html'
+    post = get_object_or_404(Post, pk=post_id)
+    if post.author != request.user and not request.user.is_staff:
+        return redirect('posts:post_detail', post_id=post_id)
+    revisions = post.revisions.select_related('editor', 'group').defer('text')
+    selected = request.GET.get('revision', '')
+    if selected.isdigit():
+        selected = int(selected)
+    else:
+        selected = revisions[0].number if revisions else None
+    context = {
+        'post': post,
+        'revisions': revisions,
+        'selected': selected,
+        'selected_text': revision_text(post, selected) if selected else None,
+    }
+    return render(request, template, context)
+
+
+@query_budget(queries=6, ms=500)
 @login_required
+@ratelimit('30/m')
 def add_comment(request, post_id):
     template = 'posts:post_detail'
     post = get_object_or_404(Post, pk=post_id)
@@ -114,3 +372,26 @@ def add_comment(request, post_id):
         comment.post = post
         comment.save()
         return redirect(template, post_id=post_id)
+
+
+@query_budget(queries=12, ms=500)
+@login_required
+@require_POST
+def post_delete(request, post_id):
+    post = get_object_or_404(Post, pk=post_id)
+    if post.author != request.user:
+        return redirect('posts:post_detail', post_id=post_id)
+    delete_post(post)
+    return redirect('posts:profile', request.user)
+
+
+@query_budget(queries=6, ms=500)
+@login_required
+@require_POST
+def comment_delete(request, post_id, comment_id):
+    comment = get_object_or_404(
+        Comment, pk=comment_id, post_id=post_id, post__deleted__isnull=True
+    )
+    if comment.author_id == request.user.pk:
+        delete_comments([comment.pk])
+    return redirect('posts:post_detail', post_id=post_id)
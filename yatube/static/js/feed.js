@@ -0,0 +1,59 @@
+// Бесконечная лента: при прокрутке к концу страницы подгружает
+// HTML-фрагмент со следующими карточками. Без JavaScript и без
+// IntersectionObserver остаётся обычная навигация по страницам.
+(function () {
+  'use strict';
+
+  var sentinel = document.querySelector('[data-feed-next]');
+  var feed = document.querySelector('[data-feed]');
+  if (!sentinel || !feed || !window.fetch || !('IntersectionObserver' in window)) {
+    return;
+  }
+  var pagination = document.querySelector('.pagination');
+  if (pagination) {
+    pagination.parentNode.hidden = true;
+  }
+  var loading = false;
+
+  function stop() {
+    observer.disconnect();
+    sentinel.remove();
+  }
+
+  function load() {
+    loading = true;
+    fetch(sentinel.getAttribute('data-feed-next'), {credentials: 'omit'})
+      .then(function (response) {
+        if (!response.ok) {
+          throw new Error(response.status);
+        }
+        return response.text();
+      })
+      .then(function (html) {
+        var template = document.createElement('template');
+        template.innerHTML = html;
+        var next = template.content.querySelector('[data-feed-next]');
+        if (next) {
+          sentinel.setAttribute('data-feed-next', next.getAttribute('data-feed-next'));
+          next.remove();
+        } else {
+          stop();
+        }
+        feed.appendChild(template.content);
+        loading = false;
+      })
+      .catch(function () {
+        stop();
+        if (pagination) {
+          pagination.parentNode.hidden = false;
+        }
+      });
+  }
+
+  var observer = new IntersectionObserver(function (entries) {
+    if (entries[0].isIntersecting && !loading) {
+      load();
+    }
+  }, {rootMargin: '600px'});
+  observer.observe(sentinel);
+})();
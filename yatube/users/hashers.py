@@ -0,0 +1,143 @@
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import (Argon2PasswordHasher,
+                                         BasePasswordHasher,
+                                         PBKDF2PasswordHasher, mask_hash)
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_noop as _
+
+POOL_THREAD_PREFIX = 'password-hashing'
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def hashing_pool():
+    """Общий на процесс пул: не больше PASSWORD_HASHING_WORKERS хэшей разом."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                thread_name_prefix=POOL_THREAD_PREFIX,
+            )
+    return _pool
+
+
+def run_in_pool(func, *args):
+    # verify() многих хэшеров вызывает encode(): внутри пула считаем сразу,
+    # иначе поток пула ждал бы сам себя.
+    if threading.current_thread().name.startswith(POOL_THREAD_PREFIX):
+        return func(*args)
+    return hashing_pool().submit(func, *args).result()
+
+
+class PooledHasherMixin:
+    """Выносит расчёт хэша в ограниченный пул потоков.
+
+    Всплеск входов занимает не больше PASSWORD_HASHING_WORKERS ядер,
+    остальные запросы (ленты) продолжают обслуживаться.
+    """
+
+    def encode(self, password, salt, *args):
+        return run_in_pool(super().encode, password, salt, *args)
+
+    def verify(self, password, encoded):
+        return run_in_pool(super().verify, password, encoded)
+
+
+class ScryptPasswordHasher(BasePasswordHasher):
+    """scrypt из hashlib в формате ScryptPasswordHasher Django 4.0."""
+
+    algorithm = 'scrypt'
+    block_size = 8
+    maxmem = 0
+    parallelism = 1
+    work_factor = 2 ** 14
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        assert password is not None
+        assert salt and '$' not in salt
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        hash_ = hashlib.scrypt(
+            password.encode(),
+            salt=salt.encode(),
+            n=n,
+            r=r,
+            p=p,
+            maxmem=self.maxmem,
+            dklen=64,
+        )
+        hash_ = base64.b64encode(hash_).decode('ascii').strip()
+        return '%s$%d$%s$%d$%d$%s' % (self.algorithm, n, salt, r, p, hash_)
+
+    def decode(self, encoded):
+        algorithm, work_factor, salt, block_size, parallelism, hash_ = (
+            encoded.split('$', 6)
+        )
+        assert algorithm == self.algorithm
+        return {
+            'algorithm': algorithm,
+            'work_factor': int(work_factor),
+            'salt': salt,
+            'block_size': int(block_size),
+            'parallelism': int(parallelism),
+            'hash': hash_,
+        }
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = self.encode(
+            password,
+            decoded['salt'],
+            decoded['work_factor'],
+            decoded['block_size'],
+            decoded['parallelism'],
+        )
+        return constant_time_compare(encoded, encoded_2)
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return OrderedDict([
+            (_('algorithm'), decoded['algorithm']),
+            (_('work factor'), decoded['work_factor']),
+            (_('block size'), decoded['block_size']),
+            (_('parallelism'), decoded['parallelism']),
+            (_('salt'), mask_hash(decoded['salt'])),
+            (_('hash'), mask_hash(decoded['hash'])),
+        ])
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return (
+            decoded['work_factor'] != self.work_factor
+            or decoded['block_size'] != self.block_size
+            or decoded['parallelism'] != self.parallelism
+        )
+
+    def harden_runtime(self, password, encoded):
+        # Время scrypt определяется параметрами из самого хэша
+        pass
+
+
+class PooledArgon2PasswordHasher(PooledHasherMixin, Argon2PasswordHasher):
+    # ~19 МиБ памяти и два прохода: один хэш за десятки миллисекунд
+    # вместо сотни у PBKDF2 со 150000 итераций.
+    time_cost = 2
+    memory_cost = 19456
+    parallelism = 1
+
+
+class PooledScryptPasswordHasher(PooledHasherMixin, ScryptPasswordHasher):
+    pass
+
+
+class PooledPBKDF2PasswordHasher(PooledHasherMixin, PBKDF2PasswordHasher):
+    """Проверка старых паролей; при входе они перехэшируются."""
@@ -0,0 +1,43 @@
+import time
+
+from django.contrib.auth.hashers import check_password
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+PASSWORD = 'correct horse battery staple'
+# Было: стандартный PBKDF2 Django 2.2; стало: хэшеры из settings
+HASHERS = (
+    ('до: pbkdf2_sha256', 'django.contrib.auth.hashers.PBKDF2PasswordHasher'),
+    ('после: argon2', 'users.hashers.PooledArgon2PasswordHasher'),
+    ('после: scrypt', 'users.hashers.PooledScryptPasswordHasher'),
+)
+
+
+class Command(BaseCommand):
+    help = 'Сколько проверок пароля (входов) в секунду выдерживает одно ядро.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seconds', type=float, default=2.0,
+            help='Длительность замера для каждого хэшера.',
+        )
+
+    def logins_per_second(self, encoded, seconds):
+        logins = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            check_password(PASSWORD, encoded)
+            logins += 1
+        return logins / (time.perf_counter() - start)
+
+    def handle(self, *args, **options):
+        baseline = None
+        for name, hasher_path in HASHERS:
+            hasher = import_string(hasher_path)()
+            encoded = hasher.encode(PASSWORD, hasher.salt())
+            rate = self.logins_per_second(encoded, options['seconds'])
+            baseline = baseline or rate
+            self.stdout.write(
+                f'{name:<20} {rate:8.1f} входов/с на ядро  '
+                f'x{rate / baseline:.1f}'
+            )
@@ -0,0 +1,87 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import (PBKDF2PasswordHasher,
+                                         check_password, identify_hasher)
+from django.test import Client, TestCase, override_settings
+
+from .. import hashers
+from ..hashers import PooledScryptPasswordHasher, ScryptPasswordHasher
+
+User = get_user_model()
+PASSWORD = 'Пароль-123'
+
+
+class ScryptPasswordHasherTests(TestCase):
+    def test_encode_and_verify(self):
+        """scrypt проверяет верный пароль и отвергает неверный."""
+        hasher = ScryptPasswordHasher()
+        encoded = hasher.encode(PASSWORD, hasher.salt())
+        self.assertTrue(encoded.startswith('scrypt$16384$'))
+        self.assertTrue(hasher.verify(PASSWORD, encoded))
+        self.assertFalse(hasher.verify('неверный', encoded))
+        self.assertFalse(hasher.must_update(encoded))
+
+    def test_must_update_on_new_work_factor(self):
+        hasher = ScryptPasswordHasher()
+        encoded = hasher.encode(PASSWORD, hasher.salt(), n=2 ** 10)
+        self.assertTrue(hasher.must_update(encoded))
+
+
+class RehashOnLoginTests(TestCase):
+    def test_pbkdf2_password_rehashed_on_login(self):
+        """Старый PBKDF2-хэш пересчитывается в Argon2 при входе."""
+        legacy = PBKDF2PasswordHasher()
+        user = User.objects.create_user(username='author')
+        user.password = legacy.encode(PASSWORD, legacy.salt())
+        user.save()
+        self.assertTrue(
+            Client().login(username='author', password=PASSWORD)
+        )
+        user.refresh_from_db()
+        self.assertEqual(identify_hasher(user.password).algorithm, 'argon2')
+        self.assertTrue(check_password(PASSWORD, user.password))
+
+
+@override_settings(PASSWORD_HASHING_WORKERS=1)
+class HashingPoolTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(hashers, '_pool', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_pool_bounds_concurrency(self):
+        """Одновременно считается не больше PASSWORD_HASHING_WORKERS хэшей."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_encode(self, password, salt, *args):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            return 'scrypt$1$salt$1$1$hash'
+
+        hasher = PooledScryptPasswordHasher()
+        with mock.patch.object(ScryptPasswordHasher, 'encode', slow_encode):
+            threads = [
+                threading.Thread(target=hasher.encode, args=(PASSWORD, 's'))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(max(peak), 1)
+        self.assertEqual(len(peak), 4)
+
+    def test_verify_inside_pool_does_not_deadlock(self):
+        """verify, вызывающий encode, не ждёт сам себя в пуле."""
+        hasher = PooledScryptPasswordHasher()
+        encoded = hasher.encode(PASSWORD, hasher.salt())
+        self.assertTrue(hasher.verify(PASSWORD, encoded))
@@ -2,6 +2,8 @@ from django.contrib.auth.views import (LoginView, LogoutView,
                                        PasswordChangeView, PasswordResetView)
 from django.urls import path
 
+from core.ratelimit import key_by_ip, ratelimit
+
 from . import views
 
 app_name = 'users'
@@ -19,13 +21,17 @@ urlpatterns = [
     ),
     path(
         'login/',
-        LoginView.as_view(template_name='users/login.html'),
+        ratelimit('10/m', key=key_by_ip, scope='users.login')(
+            LoginView.as_view(template_name='users/login.html')
+        ),
         name='login'
     ),
     path(
         'password_reset/',
-        PasswordResetView.as_view(
-            template_name='users/password_reset_form.html'
+        ratelimit('5/m', key=key_by_ip, scope='users.password_reset')(
+            PasswordResetView.as_view(
+                template_name='users/password_reset_form.html'
+            )
         ),
         name='password_reset_form'
     ),
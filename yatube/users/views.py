@@ -1,9 +1,20 @@
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView
 
+from core.budget import query_budget
+from core.ratelimit import key_by_ip, ratelimit
+
 from .forms import CreationForm
 
 
+@method_decorator(
+    query_budget(queries=6, ms=500, name='users.views.SignUp'),
+    name='dispatch',
+)
+@method_decorator(
+    ratelimit('5/m', key=key_by_ip, scope='users.signup'), name='dispatch'
+)
 class SignUp(CreateView):
     form_class = CreationForm
     success_url = reverse_lazy('posts:index')
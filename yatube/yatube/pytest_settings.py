@@ -0,0 +1,14 @@
+"""Настройки для прогона тестов через pytest (pytest.ini)."""
+
+import os
+
+from .test_settings import *  # noqa: F401,F403
+from .test_settings import BASE_DIR, DATABASES
+
+# Файловая тестовая база переживает прогон: pytest --reuse-db не
+# пересоздаёт схему и не гоняет миграции заново. Воркеры xdist получают
+# свои копии с суффиксом. Имя своё, чтобы manage.py test (база в памяти)
+# не наткнулся на неё и не остановился на вопросе об удалении.
+DATABASES['default']['TEST'] = {
+    'NAME': os.path.join(BASE_DIR, 'pytest_db.sqlite3'),
+}
@@ -33,8 +33,11 @@ ALLOWED_HOSTS = [
 
 # Application definition
 
+# SimpleAdminConfig не ищет admin.py при старте: модули админки
+# подгружаются вместе с URLconf (admin.autodiscover() в yatube/urls.py),
+# поэтому management-командам и загрузке воркера они не нужны
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    'django.contrib.admin.apps.SimpleAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -49,6 +52,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -89,6 +93,8 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # manage.py test держит тестовую базу в памяти; файловая база
+        # для pytest --reuse-db задана в yatube/pytest_settings.py
     }
 }
 
@@ -110,6 +116,18 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Первый хэшер используется для новых паролей; старые хэши PBKDF2
+# проверяются следующими и при входе прозрачно пересчитываются в первый.
+# Для scrypt вместо Argon2 поменяйте первые две строки местами.
+PASSWORD_HASHERS = [
+    'users.hashers.PooledArgon2PasswordHasher',
+    'users.hashers.PooledScryptPasswordHasher',
+    'users.hashers.PooledPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+# сколько хэшей паролей может считаться одновременно в одном процессе
+PASSWORD_HASHING_WORKERS = 2
+
 # Internationalization
 # https://docs.djangoproject.com/en/2.2/topics/i18n/
 
@@ -132,8 +150,10 @@ LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 # LOGOUT_REDIRECT_URL = 'posts:index'
 
-# подключаем движок filebased.EmailBackend
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# письма ставятся в очередь и отправляются пачками фоновым потоком
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+# а доставляет их движок filebased.EmailBackend
+EMAIL_QUEUE_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 # указываем директорию, в которую будут складываться файлы писем
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
@@ -142,3 +162,56 @@ CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
+# режим заглушек: вместо нарезки миниатюр отдаются картинки-пустышки
+THUMBNAIL_DUMMY = False
+
+# Тесты идут с настройками yatube/test_settings.py:
+#   python manage.py test --settings=yatube.test_settings
+# pytest подхватывает их сам (pytest.ini)
+
+# группы, авторы и посты из URL кэшируются в памяти процесса (LRU с
+# лимитом по байтам); правки из других воркеров видны через TTL секунд
+OBJECT_CACHE_ENABLED = True
+OBJECT_CACHE_MAX_BYTES = 4 * 1024 * 1024
+OBJECT_CACHE_TTL = 30
+
+# ленты и страница поста отдаются потоком: шапка уходит клиенту, пока
+# рисуются карточки и комментарии. По умолчанию выключено — у потокового
+# ответа нет response.content, на который рассчитаны тесты; включается
+# в настройках развёртывания.
+STREAMING_RESPONSES = False
+
+# сжатие ответов: brotli, если установлен пакет brotli, иначе gzip
+COMPRESS_MIN_LENGTH = 1024
+COMPRESS_CONTENT_TYPES = (
+    'text/', 'application/json', 'application/javascript', 'image/svg+xml',
+)
+BROTLI_QUALITY = 5
+
+# бюджеты запросов и времени view (core.budget.query_budget): в работе
+# превышение — предупреждение в лог, в тестах (BUDGET_STRICT) лишние
+# запросы — ошибка
+BUDGET_ENABLED = True
+BUDGET_STRICT = False
+
+# массовые действия админки выполняются пачками в фоновом потоке;
+# тесты выполняют их сразу через override_settings(BULK_JOBS_ASYNC=False).
+# Задачи, прерванные перезапуском, закрывает команда fail_stale_jobs
+BULK_JOBS_ASYNC = True
+
+# ленты читают денормализованную таблицу FeedItem вместо JOIN постов с
+# авторами и группами; после включения: manage.py rebuild_feed
+FEED_READ_MODEL = False
+
+# ограничение частоты записей и входа: корзины токенов в памяти процесса;
+# для общего лимита между процессами — 'core.ratelimit.CacheStore'
+RATELIMIT_ENABLED = True
+RATELIMIT_STORE = 'core.ratelimit.LocalMemoryStore'
+RATELIMIT_CACHE_ALIAS = 'default'
+
+# about и 404 собираются в файлы командой prerender при деплое;
+# при разработке шаблоны меняются часто, поэтому отдаём их как обычно
+PRERENDER_ENABLED = not DEBUG
+PRERENDER_ROOT = os.path.join(BASE_DIR, 'prerendered')
+PRERENDER_MAX_AGE = 60 * 60 * 24
@@ -0,0 +1,25 @@
+"""Настройки тестов.
+
+python manage.py test --settings=yatube.test_settings; pytest берёт
+их через yatube/pytest_settings.py. Тесты, которым важны эти значения,
+задают их сами через override_settings: набор проходит и с
+yatube.settings, здесь только общие умолчания для прогона.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+# загрузки живут в памяти процесса, а миниатюры не нарезаются — диск
+# не нужен, воркеры xdist не мешают друг другу
+DEFAULT_FILE_STORAGE = 'core.storage.InMemoryStorage'
+THUMBNAIL_DUMMY = True
+
+# откат транзакции после теста не шлёт сигналов сброса кэша объектов
+OBJECT_CACHE_ENABLED = False
+
+# тестовому клиенту нужен response.content; потоковые ответы
+# проверяются через override_settings(STREAMING_RESPONSES=True)
+STREAMING_RESPONSES = False
+
+# лишний запрос сверх бюджета — ошибка теста; время только в лог:
+# общий CI медленнее и шумнее
+BUDGET_STRICT = True
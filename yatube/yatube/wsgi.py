@@ -7,6 +7,7 @@ For more information on this file, see
 https://docs.djangoproject.com/en/2.2/howto/deployment/wsgi/
 """
 
+import atexit
 import os
 
 from django.core.wsgi import get_wsgi_application
@@ -14,3 +15,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+# Только веб-процесс: у тестов и management-команд к выходу базы, куда
+# писать просмотры, может уже не быть
+from posts.counters import view_counter  # noqa: E402
+
+atexit.register(view_counter.try_flush)